@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+from reviews.models import User
+
+from api_yamdb.metrics import observe_cache
+
+from .cache import get_versions
+
+# Model.from_db() ждёт значения в порядке полей модели.
+PRINCIPAL_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields
+    if field.attname in {
+        'id', 'username', 'role', 'is_superuser', 'is_staff', 'is_active',
+        # Сигналы счётчиков проверяют, не удалён ли автор.
+        'is_deleted',
+    }
+)
+
+
+def user_dependency(user_id):
+    return f'user:{user_id}'
+
+
+class UserCache:
+    """Ограниченный LRU-кэш полей пользователей внутри процесса.
+
+    Записи сбрасываются сигналами при изменении пользователя. Каждая
+    запись помнит версию пользователя из общего кэша, поэтому другие
+    процессы замечают изменение при следующем чтении. Без общего кэша
+    версии нет, поэтому по умолчанию ``JWT_USER_CACHE_SIZE`` нулевой
+    и кэш выключен.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, version=None):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, cached_version, values = entry
+            if expires < time.monotonic() or cached_version != version:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return values
+
+    def set(self, user_id, values, version=None):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (
+                time.monotonic() + self.ttl, version, values
+            )
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(
+    settings.JWT_USER_CACHE_SIZE, settings.JWT_USER_CACHE_TTL
+)
+
+
+class CachedUserJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без запроса пользователя на каждый вызов.
+
+    Пользователь собирается из закэшированных полей, нужных
+    разрешениям; остальные поля загружаются из БД при первом обращении,
+    как отложенные поля ``QuerySet.only()``. Запросы на запись всегда
+    сверяют роль и активность пользователя с БД.
+    """
+
+    def authenticate(self, request):
+        self.from_database = request.method not in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            )
+        version = None
+        if settings.SHARED_CACHE:
+            version, = get_versions([user_dependency(user_id)])
+        values = None
+        if not getattr(self, 'from_database', False):
+            values = user_cache.get(user_id, version)
+            observe_cache('jwt_user', values is not None)
+        if values is None:
+            values = User.objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).values_list(*PRINCIPAL_FIELDS).first()
+            if values is None:
+                raise AuthenticationFailed(
+                    _('User not found'), code='user_not_found'
+                )
+            user_cache.set(user_id, values, version)
+        user = User.from_db(DEFAULT_DB_ALIAS, PRINCIPAL_FIELDS, values)
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        return user
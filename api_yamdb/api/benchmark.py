@@ -0,0 +1,293 @@
+import platform
+import random
+import statistics
+import time
+import uuid
+from contextlib import ExitStack
+
+import django
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connections
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from reviews.generator import WORDS
+from reviews.models import Comment, Genre, Review, Title, User
+
+from api_yamdb.middleware import QueryCounter, brotli
+
+from .renderers import FastJSONRenderer, orjson
+
+SEARCH_WORD = WORDS[0]
+
+
+class BenchmarkError(Exception):
+    """Сценарий вернул неожиданный статус ответа."""
+
+
+def dataset_size():
+    return {
+        'users': User.objects.count(),
+        'titles': Title.objects.count(),
+        'reviews': Review.objects.count(),
+        'comments': Comment.objects.count(),
+    }
+
+
+def summarize(timings, queries):
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return {
+        'runs': len(timings),
+        'min_ms': round(timings[0] * 1000, 3),
+        'median_ms': round(statistics.median(timings) * 1000, 3),
+        'p95_ms': round(p95 * 1000, 3),
+        'mean_ms': round(statistics.mean(timings) * 1000, 3),
+        'queries': max(queries),
+    }
+
+
+def client_for(user=None):
+    client = APIClient()
+    if user is not None:
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+        )
+    return client
+
+
+class Benchmark:
+    """Замеры ключевых запросов API на уже заполненной базе.
+
+    Каждый сценарий выполняется через полный стек middleware
+    ``warmup + repeat`` раз; в результат попадают только последние
+    ``repeat`` замеров. Кэш ответов на время замеров выключен.
+    """
+
+    def __init__(self, repeat=20, warmup=2, seed=0):
+        self.repeat = repeat
+        self.warmup = warmup
+        self.rng = random.Random(seed)
+        # Пользователи каждого прогона не пересекаются с прошлыми,
+        # поэтому замеры можно повторять на сохранённой базе.
+        self.run_id = uuid.uuid4().hex[:8]
+
+    def get_scenarios(self):
+        runs = self.repeat + self.warmup
+        title_ids = list(
+            Title.objects.order_by('id').values_list('id', flat=True)
+        )
+        hot_title = Title.objects.order_by('-reviews_count', 'id').first()
+        if hot_title is None:
+            raise BenchmarkError('В базе нет произведений для замера.')
+        hot_review = Review.objects.order_by('-comments_count', 'id').first()
+        genre = Genre.objects.order_by('id').first()
+        reviewers = [
+            client_for(user) for user in self.create_users('reviewer', runs)
+        ]
+        token_users = self.create_users('token', runs)
+        codes = [default_token_generator.make_token(user)
+                 for user in token_users]
+        signup = f'bench-{self.run_id}-signup'
+        anon = client_for()
+        reviews_url = f'/api/v1/titles/{hot_title.pk}/reviews/'
+        comments_url = (
+            f'/api/v1/titles/{hot_review.title_id}/reviews/'
+            f'{hot_review.pk}/comments/'
+        )
+        return {
+            'title_list': lambda run: anon.get('/api/v1/titles/'),
+            'title_list_sparse': lambda run: anon.get(
+                '/api/v1/titles/', {'fields': 'id,name,rating'}
+            ),
+            'title_detail': lambda run: anon.get(
+                f'/api/v1/titles/{self.rng.choice(title_ids)}/'
+            ),
+            'title_search': lambda run: anon.get(
+                '/api/v1/titles/', {'search': SEARCH_WORD}
+            ),
+            'title_filter': lambda run: anon.get(
+                '/api/v1/titles/', {'genre': genre.slug, 'year': 2000}
+            ),
+            'review_list_first_page': lambda run: anon.get(reviews_url),
+            'review_list_last_page': lambda run: anon.get(
+                reviews_url, {'page': last_page(hot_title.reviews_count)}
+            ),
+            'comment_list_first_page': lambda run: anon.get(comments_url),
+            'comment_list_last_page': lambda run: anon.get(
+                comments_url,
+                {'page': last_page(hot_review.comments_count)}
+            ),
+            'review_create': lambda run: reviewers[run].post(
+                reviews_url, {'text': 'Замер', 'score': 7}
+            ),
+            'signup': lambda run: anon.post('/api/v1/auth/signup/', {
+                'username': f'{signup}-{run}',
+                'email': f'{signup}-{run}@yamdb.fake',
+            }),
+            'token': lambda run: anon.post('/api/v1/auth/token/', {
+                'username': token_users[run].username,
+                'confirmation_code': codes[run],
+            }),
+        }
+
+    def get_admin_scenarios(self):
+        admin = User.objects.create_superuser(
+            f'bench-{self.run_id}-admin', f'bench-{self.run_id}@yamdb.fake',
+            None
+        )
+        client = Client()
+        client.force_login(admin)
+        review = Review.objects.order_by('-comments_count', 'id').first()
+        user = User.objects.order_by('-id').first()
+
+        def changelist(model, **params):
+            url = reverse(f'admin:reviews_{model}_changelist')
+            return lambda run: client.get(url, params)
+
+        return {
+            'admin_user_list': changelist('user'),
+            'admin_user_search': changelist('user', q=user.username),
+            'admin_title_list': changelist('title'),
+            'admin_title_search': changelist('title', q=SEARCH_WORD),
+            'admin_review_list': changelist('review'),
+            'admin_review_change': lambda run: client.get(reverse(
+                'admin:reviews_review_change', args=(review.pk,)
+            )),
+            'admin_comment_list': changelist('comment'),
+            'admin_comment_search': changelist('comment', q=review.pk),
+        }
+
+    def create_users(self, role, count):
+        prefix = f'bench-{self.run_id}-{role}'
+        User.objects.bulk_create(
+            User(username=f'{prefix}-{number}',
+                 email=f'{prefix}-{number}@yamdb.fake')
+            for number in range(count)
+        )
+        return list(User.objects.filter(
+            username__startswith=f'{prefix}-'
+        ).order_by('id'))
+
+    def measure(self, name, scenario):
+        timings, queries = [], []
+        for run in range(self.warmup + self.repeat):
+            counter = QueryCounter()
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(counter))
+                start = time.perf_counter()
+                response = scenario(run)
+                elapsed = time.perf_counter() - start
+            if response.status_code >= 300:
+                raise BenchmarkError(
+                    f'{name}: ответ {response.status_code} '
+                    f'{response.content[:200]!r}'
+                )
+            if run >= self.warmup:
+                timings.append(elapsed)
+                queries.append(counter.count)
+        return summarize(timings, queries)
+
+    def run(self, only=None):
+        with override_settings(API_CACHE_TIMEOUT=0):
+            scenarios = {
+                **self.get_scenarios(), **self.get_admin_scenarios()
+            }
+            return {
+                name: self.measure(name, scenario)
+                for name, scenario in scenarios.items()
+                if not only or name in only
+            }
+
+
+def best_time(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return result, round(min(timings) * 1000, 3)
+
+
+class RenderingBenchmark:
+    """Размер и время отрисовки и сжатия страниц списков.
+
+    Сравнивает ``JSONRenderer`` DRF с ``FastJSONRenderer`` и размер
+    ответа без сжатия, в gzip и в brotli на данных настоящих страниц
+    произведений и отзывов.
+    """
+
+    def __init__(self, repeat=20):
+        self.repeat = repeat
+
+    def get_pages(self):
+        hot_title = Title.objects.order_by('-reviews_count', 'id').first()
+        if hot_title is None:
+            raise BenchmarkError('В базе нет произведений для замера.')
+        return {
+            'title_list': '/api/v1/titles/',
+            'review_list': f'/api/v1/titles/{hot_title.pk}/reviews/',
+        }
+
+    def measure(self, data):
+        content, drf_ms = best_time(
+            lambda: JSONRenderer().render(data), self.repeat
+        )
+        fast, fast_ms = best_time(
+            lambda: FastJSONRenderer().render(data), self.repeat
+        )
+        if fast != content:
+            raise BenchmarkError('FastJSONRenderer отдаёт другой JSON.')
+        gzipped, gzip_ms = best_time(
+            lambda: compress_string(content), self.repeat
+        )
+        result = {
+            'bytes': {'json': len(content), 'gzip': len(gzipped)},
+            'ms': {
+                'render_drf': drf_ms,
+                'render_fast': fast_ms if orjson else None,
+                'gzip': gzip_ms,
+            },
+        }
+        if brotli is not None:
+            compressed, brotli_ms = best_time(
+                lambda: brotli.compress(
+                    content, quality=settings.BROTLI_QUALITY
+                ),
+                self.repeat,
+            )
+            result['bytes']['br'] = len(compressed)
+            result['ms']['br'] = brotli_ms
+        return result
+
+    def run(self):
+        client = APIClient()
+        results = {}
+        with override_settings(API_CACHE_TIMEOUT=0):
+            for name, url in self.get_pages().items():
+                response = client.get(url, HTTP_ACCEPT='application/json')
+                if response.status_code != 200:
+                    raise BenchmarkError(
+                        f'{name}: ответ {response.status_code}'
+                    )
+                results[name] = self.measure(response.data)
+        return results
+
+
+def last_page(count):
+    return max(1, -(-count // api_settings.PAGE_SIZE))
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'vendor': connections['default'].vendor,
+    }
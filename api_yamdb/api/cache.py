@@ -0,0 +1,124 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+
+from api_yamdb.metrics import observe_cache
+
+VERSION_KEY_PREFIX = 'api:version:'
+RESPONSE_KEY_PREFIX = 'api:response:'
+CACHEABLE_METHODS = ('GET', 'HEAD')
+
+
+def title_dependency(title_id):
+    return f'title:{title_id}'
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def _initial_version():
+    # Версия после вытеснения ключа не повторяет прежние значения.
+    return int(time.time() * 1000)
+
+
+def get_versions(names):
+    """Текущие версии зависимостей одним обращением к кэшу."""
+    cache = get_cache()
+    keys = [VERSION_KEY_PREFIX + name for name in names]
+    versions = cache.get_many(keys)
+    missing = {key: _initial_version() for key in keys if key not in versions}
+    for key, version in missing.items():
+        if not cache.add(key, version, timeout=None):
+            missing[key] = cache.get(key, version)
+    versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(*names):
+    """Делает устаревшими ответы, зависящие от ``names``.
+
+    Внутри транзакции версии меняются ещё раз после её фиксации,
+    чтобы параллельный запрос не закэшировал старые данные
+    под новой версией.
+    """
+    def bump():
+        cache = get_cache()
+        for name in names:
+            key = VERSION_KEY_PREFIX + name
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, _initial_version(), timeout=None)
+
+    bump()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(bump)
+
+
+class CachedResponseMixin:
+    """Отдаёт ответы на чтение из кэша до аутентификации и запросов к БД.
+
+    Ключ ответа включает версии всех зависимостей из
+    ``get_cache_dependencies``, поэтому запись в любую из них
+    сразу делает закэшированные ответы недоступными. Запросы
+    с заголовком ``Authorization`` из кэша не отвечаются: токен
+    сначала проверяет DRF, иначе просроченный токен получал бы 200
+    при попадании в кэш и 401 при промахе.
+    """
+    cache_dependencies = ()
+
+    def get_cache_dependencies(self, action, **kwargs):
+        return self.cache_dependencies
+
+    def get_response_cache_key(self, request, dependencies):
+        versions = get_versions(dependencies)
+        raw_key = '|'.join((
+            type(self).__name__,
+            request.get_full_path(),
+            request.META.get('HTTP_ACCEPT', ''),
+            *(f'{name}={version}'
+              for name, version in zip(dependencies, versions)),
+        ))
+        return RESPONSE_KEY_PREFIX + hashlib.md5(
+            raw_key.encode()
+        ).hexdigest()
+
+    def dispatch(self, request, *args, **kwargs):
+        if (
+            request.method not in CACHEABLE_METHODS
+            or not settings.API_CACHE_TIMEOUT
+        ):
+            return super().dispatch(request, *args, **kwargs)
+        action = self.action_map.get(request.method.lower())
+        key = self.get_response_cache_key(
+            request, self.get_cache_dependencies(action, **kwargs)
+        )
+        cached = None
+        if 'HTTP_AUTHORIZATION' not in request.META:
+            cached = get_cache().get(key)
+            observe_cache('response', cached is not None)
+        if cached is not None:
+            content, status, content_type = cached
+            return HttpResponse(
+                content, status=status, content_type=content_type
+            )
+        response = super().dispatch(request, *args, **kwargs)
+        if (
+            response.status_code == 200
+            and getattr(response, 'accepted_media_type', '').startswith(
+                'application/json'
+            )
+        ):
+            response.render()
+            get_cache().set(
+                key,
+                (response.content, response.status_code,
+                 response['Content-Type']),
+                settings.API_CACHE_TIMEOUT
+            )
+        return response
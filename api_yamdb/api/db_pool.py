@@ -0,0 +1,99 @@
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+COUNTERS = ('opened', 'reused', 'discarded')
+
+
+class ConnectionStats:
+    """Счётчики соединений с БД в пределах одного воркера."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def increment(self, alias, counter):
+        with self._lock:
+            counters = self._counters.setdefault(
+                alias, dict.fromkeys(COUNTERS, 0)
+            )
+            counters[counter] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                alias: dict(counters)
+                for alias, counters in self._counters.items()
+            }
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+
+
+connection_stats = ConnectionStats()
+
+
+@receiver(connection_created)
+def count_opened(sender, connection, **kwargs):
+    connection_stats.increment(connection.alias, 'opened')
+
+
+@receiver(request_started)
+def check_connections(**kwargs):
+    """Проверяет постоянные соединения перед началом запроса.
+
+    Просроченные соединения к этому моменту уже закрыты Django.
+    Оставшиеся открытыми считаются переиспользованными, если
+    переживают ``is_usable()``; иначе соединение закрывается
+    и будет открыто заново при первом запросе к БД. Соединения,
+    простоявшие меньше ``DB_HEALTH_CHECK_IDLE`` секунд, не проверяются,
+    чтобы не тратить на каждый запрос лишний поход в БД.
+    """
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is None or connection.in_atomic_block:
+            continue
+        last_used = getattr(connection, 'last_used', None)
+        if (
+            settings.DB_HEALTH_CHECKS
+            and (
+                last_used is None
+                or now - last_used >= settings.DB_HEALTH_CHECK_IDLE
+            )
+            and not connection.is_usable()
+        ):
+            connection.close()
+            connection_stats.increment(connection.alias, 'discarded')
+            continue
+        connection_stats.increment(connection.alias, 'reused')
+
+
+@receiver(request_finished)
+def mark_connections_used(**kwargs):
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is not None:
+            connection.last_used = now
+
+
+def get_diagnostics():
+    counters = connection_stats.snapshot()
+    return {
+        'pid': os.getpid(),
+        'health_checks': settings.DB_HEALTH_CHECKS,
+        'databases': {
+            connection.alias: {
+                'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+                'is_open': connection.connection is not None,
+                **counters.get(connection.alias, dict.fromkeys(COUNTERS, 0)),
+            }
+            for connection in connections.all()
+        },
+    }
@@ -0,0 +1,58 @@
+import csv
+import json
+from collections import defaultdict
+
+from reviews.models import GenreTitle
+from reviews.utils import chunked
+
+EXPORT_COLUMNS = (
+    'id', 'name', 'year', 'description', 'rating', 'reviews_count',
+    'category', 'genre',
+)
+EXPORT_CHUNK_SIZE = 900
+
+
+class Echo:
+    """Буфер для ``csv.writer``, который сразу отдаёт записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def iter_titles(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Произведения с категорией, жанрами и рейтингом по одному.
+
+    Строки читаются серверным курсором, а жанры догружаются одним
+    запросом на пачку, так что память не растёт вместе с таблицей.
+    """
+    rows = queryset.order_by('pk').values_list(
+        'id', 'name', 'year', 'description', 'rating', 'reviews_count',
+        'category__slug'
+    ).iterator(chunk_size=chunk_size)
+    for chunk in chunked(rows, chunk_size):
+        genres = defaultdict(list)
+        for title_id, slug in GenreTitle.objects.filter(
+            title_id__in=[row[0] for row in chunk]
+        ).order_by('genre__slug').values_list('title_id', 'genre__slug'):
+            genres[title_id].append(slug)
+        for row in chunk:
+            yield dict(zip(EXPORT_COLUMNS, (*row, genres[row[0]])))
+
+
+def iter_ndjson(titles):
+    for title in titles:
+        yield json.dumps(title, ensure_ascii=False) + '\n'
+
+
+def iter_csv(titles):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for title in titles:
+        title['genre'] = ','.join(title['genre'])
+        yield writer.writerow(title[column] for column in EXPORT_COLUMNS)
+
+
+EXPORT_FORMATS = {
+    'ndjson': (iter_ndjson, 'application/x-ndjson; charset=utf-8'),
+    'csv': (iter_csv, 'text/csv; charset=utf-8'),
+}
@@ -0,0 +1,221 @@
+from operator import itemgetter
+
+from django.conf import settings
+from django.db.models import F, ManyToManyField
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from api_yamdb.middleware import serializer_timing
+
+PARENT_KEY = '_parent_pk'
+
+# Поля, чьё to_representation сводится к приведению типа.
+CONVERTERS = {
+    serializers.CharField: str,
+    serializers.IntegerField: int,
+}
+
+
+class UnsupportedSerializerError(Exception):
+    """Сериализатор нельзя повторить на строках ``values()``."""
+
+
+def datetime_converter(field):
+    """``DateTimeField.to_representation`` без лишних проверок.
+
+    Значения из базы уже в текущей временной зоне, поэтому остаётся
+    только ``isoformat()``; остальные случаи уходят в само поле.
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if (
+        not settings.USE_TZ
+        or getattr(field, 'timezone', None) is not None
+        or output_format is None
+        or output_format.lower() != ISO_8601
+    ):
+        return field.to_representation
+
+    def convert(value):
+        if value.tzinfo is not timezone.get_current_timezone():
+            return field.to_representation(value)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            return value[:-6] + 'Z'
+        return value
+    return convert
+
+
+def value_getter(key, convert):
+    def get(row):
+        value = row[key]
+        return None if value is None else convert(value)
+    return get
+
+
+def nested_getter(null_key, mapper):
+    def get(row):
+        if row[null_key] is None:
+            return None
+        return mapper.to_representation(row)
+    return get
+
+
+def raw_getter(key):
+    def get(row):
+        return row[key]
+    return get
+
+
+class SlugMapper:
+    """Связанный объект, представленный одной колонкой ``slug_field``."""
+
+    def __init__(self, model, slug_field):
+        self.model = model
+        self.columns = [slug_field]
+        self.to_representation = itemgetter(slug_field)
+
+
+class ValuesMapper:
+    """Представление сериализатора, собранное из строк ``values()``.
+
+    Для каждого поля сериализатора заранее выбирается колонка и функция
+    преобразования — те же, что вызвал бы сам сериализатор, — поэтому
+    результат совпадает с ``serializer.data`` до байта, но без создания
+    моделей и обхода полей DRF на каждой записи. Связи многие-ко-многим
+    догружаются одним запросом на страницу.
+    """
+
+    def __init__(self, serializer, prefix=''):
+        self.model = serializer.Meta.model
+        self.columns = []
+        self.getters = []
+        self.many = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            self.getters.append((name, self.compile_field(field, prefix)))
+
+    def compile_field(self, field, prefix):
+        if field.source == '*' or isinstance(
+            field, serializers.SerializerMethodField
+        ):
+            raise UnsupportedSerializerError(field.field_name)
+        key = prefix + '__'.join(field.source_attrs)
+        if isinstance(field, (
+            serializers.ListSerializer, serializers.ManyRelatedField
+        )):
+            if prefix or not isinstance(
+                self.model._meta.get_field(key), ManyToManyField
+            ):
+                raise UnsupportedSerializerError(field.field_name)
+            self.many.append((key, self.compile_many(field, key)))
+            return raw_getter(key)
+        if isinstance(field, serializers.BaseSerializer):
+            nested = ValuesMapper(field, prefix=key + '__')
+            if nested.many:
+                raise UnsupportedSerializerError(field.field_name)
+            self.columns.append(key)
+            self.columns.extend(nested.columns)
+            return nested_getter(key, nested)
+        if isinstance(field, serializers.SlugRelatedField):
+            key = f'{key}__{field.slug_field}'
+            self.columns.append(key)
+            return raw_getter(key)
+        if isinstance(field, serializers.RelatedField):
+            raise UnsupportedSerializerError(field.field_name)
+        self.columns.append(key)
+        if isinstance(field, serializers.DateTimeField):
+            return value_getter(key, datetime_converter(field))
+        return value_getter(
+            key, CONVERTERS.get(type(field), field.to_representation)
+        )
+
+    def compile_many(self, field, key):
+        if isinstance(field, serializers.ListSerializer):
+            return ValuesMapper(field.child)
+        if not isinstance(field.child_relation, serializers.SlugRelatedField):
+            raise UnsupportedSerializerError(field.field_name)
+        return SlugMapper(
+            self.model._meta.get_field(key).related_model,
+            field.child_relation.slug_field,
+        )
+
+    def to_representation(self, row):
+        return {name: get(row) for name, get in self.getters}
+
+    def load_many(self, rows):
+        if not self.many or not rows:
+            return
+        pks = [row['pk'] for row in rows]
+        for key, child in self.many:
+            relation = self.model._meta.get_field(key)
+            related = {pk: [] for pk in pks}
+            for item in child.model._default_manager.filter(**{
+                f'{relation.related_query_name()}__in': pks
+            }).values(
+                *child.columns,
+                **{PARENT_KEY: F(relation.related_query_name())}
+            ):
+                related[item[PARENT_KEY]].append(
+                    child.to_representation(item)
+                )
+            for row in rows:
+                row[key] = related[row['pk']]
+
+    def values(self, queryset, extra=()):
+        """Queryset словарей со всеми колонками представления.
+
+        Колонки ``extra`` выбираются сверх полей сериализатора и в
+        представление не попадают.
+        """
+        columns = list(self.columns)
+        columns.extend(name for name in extra if name not in columns)
+        return queryset.prefetch_related(None).values('pk', *columns)
+
+    def represent(self, rows):
+        with serializer_timing():
+            rows = list(rows)
+            self.load_many(rows)
+            return [self.to_representation(row) for row in rows]
+
+
+class ValuesListMixin:
+    """Быстрый путь ``list`` без моделей и полей DRF на каждую запись.
+
+    Сериализатор списка компилируется в ``ValuesMapper`` один раз
+    на класс представления и набор полей из ``fieldset`` контекста;
+    если в нём есть поля, которые нельзя повторить на строках
+    ``values()``, используется обычный ``list``.
+    """
+
+    def get_values_mapper(self):
+        view_class = type(self)
+        context = self.get_serializer_context()
+        key = self.get_serializer_class(), context.get('fieldset')
+        cache = view_class.__dict__.get('_values_mappers')
+        if cache is None:
+            cache = view_class._values_mappers = {}
+        if key not in cache:
+            try:
+                cache[key] = ValuesMapper(key[0](context=context))
+            except UnsupportedSerializerError:
+                cache[key] = None
+        return cache[key]
+
+    def list(self, request, *args, **kwargs):
+        mapper = self.get_values_mapper()
+        if mapper is None:
+            return super().list(request, *args, **kwargs)
+        # Курсорная навигация читает поля сортировки из каждой строки.
+        ordering = [
+            name.lstrip('-') for name in getattr(self, 'cursor_ordering', ())
+        ]
+        queryset = mapper.values(
+            self.filter_queryset(self.get_queryset()), extra=ordering
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(mapper.represent(page))
+        return Response(mapper.represent(queryset))
@@ -0,0 +1,154 @@
+from collections import namedtuple
+
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+# ``fields`` и ``expand`` — frozenset имён или None, если параметра нет.
+Fieldset = namedtuple('Fieldset', ('fields', 'expand'))
+
+
+def split_names(value):
+    return frozenset(name.strip() for name in value.split(',') if name.strip())
+
+
+def collapse(field):
+    """Вложенный сериализатор, свёрнутый до ``lookup_field`` объектов."""
+    many = isinstance(field, serializers.ListSerializer)
+    child = field.child if many else field
+    lookup_field = getattr(child.Meta, 'lookup_field', 'pk')
+    if lookup_field == 'pk':
+        return serializers.PrimaryKeyRelatedField(read_only=True, many=many)
+    return serializers.SlugRelatedField(
+        slug_field=lookup_field, read_only=True, many=many
+    )
+
+
+class FieldsetSerializerMixin:
+    """Оставляет в сериализаторе только запрошенные поля.
+
+    Набор полей берётся из ``fieldset`` в контексте. Вложенные
+    сериализаторы разворачиваются, если параметра ``expand`` нет
+    или они в нём перечислены; иначе отдаются ``lookup_field``
+    связанных объектов.
+    """
+
+    @classmethod
+    def parse_fieldset(cls, params):
+        if FIELDS_PARAM not in params and EXPAND_PARAM not in params:
+            return None
+        fields = split_names(params.get(FIELDS_PARAM, '')) or None
+        expand = None
+        if EXPAND_PARAM in params:
+            expand = split_names(params[EXPAND_PARAM])
+        errors = {}
+        unknown = sorted((fields or set()) - set(cls.Meta.fields))
+        if unknown:
+            errors[FIELDS_PARAM] = f'Неизвестные поля: {", ".join(unknown)}.'
+        unknown = sorted((expand or set()) - set(cls.get_expandable_fields()))
+        if unknown:
+            errors[EXPAND_PARAM] = (
+                f'Нельзя развернуть: {", ".join(unknown)}.'
+            )
+        if errors:
+            raise ValidationError(errors)
+        return Fieldset(fields, expand)
+
+    @classmethod
+    def get_expandable_fields(cls):
+        return [
+            name for name, field in cls._declared_fields.items()
+            if isinstance(field, serializers.BaseSerializer)
+        ]
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset = self.context.get('fieldset')
+        if fieldset is None:
+            return fields
+        if fieldset.fields is not None:
+            fields = {
+                name: field for name, field in fields.items()
+                if name in fieldset.fields
+            }
+        if fieldset.expand is not None:
+            for name in self.get_expandable_fields():
+                if name in fields and name not in fieldset.expand:
+                    fields[name] = collapse(fields[name])
+        return fields
+
+
+def restrict_queryset(queryset, serializer, keep=()):
+    """Загружает только связи и колонки, нужные полям ``serializer``.
+
+    Колонки ``keep`` загружаются всегда, даже если полей для них нет.
+    """
+    columns = list(keep)
+    joins = []
+    prefetches = []
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        name = field.source_attrs[0]
+        if isinstance(field, (
+            serializers.ListSerializer, serializers.ManyRelatedField
+        )):
+            prefetches.append(name)
+        elif isinstance(field, serializers.SlugRelatedField):
+            joins.append(name)
+            columns.extend((name, f'{name}__{field.slug_field}'))
+        elif isinstance(field, (
+            serializers.BaseSerializer, serializers.RelatedField
+        )):
+            joins.append(name)
+            columns.append(name)
+        else:
+            columns.append(name)
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if joins:
+        queryset = queryset.select_related(*joins)
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+    return queryset.only(*columns)
+
+
+class SparseFieldsetMixin:
+    """Параметры ``?fields=`` и ``?expand=`` для чтения списка и объекта.
+
+    Кроме ответа сокращается и SQL: связи, которых нет в ответе,
+    не присоединяются и не догружаются, а лишние колонки
+    откладываются через ``only()``.
+    """
+    fieldset_actions = ('list', 'retrieve')
+
+    def get_fieldset(self):
+        if not hasattr(self, '_fieldset'):
+            self._fieldset = None
+            serializer_class = self.get_serializer_class()
+            if self.action in self.fieldset_actions and issubclass(
+                serializer_class, FieldsetSerializerMixin
+            ):
+                self._fieldset = serializer_class.parse_fieldset(
+                    self.request.query_params
+                )
+        return self._fieldset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fieldset'] = self.get_fieldset()
+        return context
+
+    def get_queryset(self):
+        return self.apply_fieldset(super().get_queryset())
+
+    def apply_fieldset(self, queryset, keep=()):
+        """Сокращает ``queryset`` до запрошенных полей и колонок ``keep``.
+
+        Представления без атрибута ``queryset`` вызывают его сами
+        из своего ``get_queryset``.
+        """
+        if self.get_fieldset() is None:
+            return queryset
+        return restrict_queryset(queryset, self.get_serializer(), keep)
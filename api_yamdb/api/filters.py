@@ -1,5 +1,8 @@
+from django.db.models import F
 from django_filters import rest_framework as filters
-from reviews.models import Title
+from rest_framework.filters import OrderingFilter
+from reviews.models import GenreTitle, Title
+from reviews.search import get_title_search
 
 
 class TitlesFilter(filters.FilterSet):
@@ -7,12 +10,41 @@ class TitlesFilter(filters.FilterSet):
         field_name='name',
         lookup_expr='icontains')
     category = filters.CharFilter(
-        field_name='category__slug',
-        lookup_expr='icontains')
+        field_name='category__slug')
     genre = filters.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='icontains')
+        method='filter_genre')
+    search = filters.CharFilter(
+        method='filter_search')
 
     class Meta:
         model = Title
         fields = ['name', 'year', 'genre', 'category']
+
+    def filter_genre(self, queryset, name, value):
+        return queryset.filter(id__in=GenreTitle.objects.filter(
+            genre__slug=value
+        ).values('title_id'))
+
+    def filter_search(self, queryset, name, value):
+        return get_title_search(queryset.db).search(queryset, value)
+
+
+class TitleOrderingFilter(OrderingFilter):
+    """Сортировка, в которой произведения без рейтинга идут последними."""
+    nullable_fields = ('rating',)
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+        return queryset.order_by(*(
+            self.get_expression(field) for field in ordering
+        ), 'pk')
+
+    def get_expression(self, field):
+        name = field.lstrip('-')
+        if name not in self.nullable_fields:
+            return field
+        if field.startswith('-'):
+            return F(name).desc(nulls_last=True)
+        return F(name).asc(nulls_last=True)
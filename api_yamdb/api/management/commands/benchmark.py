@@ -0,0 +1,143 @@
+import json
+import os
+from datetime import datetime, timezone
+
+from api.benchmark import (Benchmark, BenchmarkError, RenderingBenchmark,
+                           dataset_size, environment)
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import setup_test_environment, teardown_test_environment
+from reviews.generator import DataGenerator
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет отдельную тестовую базу синтетическими данными, '
+        'замеряет ключевые запросы API и сохраняет результат в JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=1000)
+        parser.add_argument('--reviews', type=int, default=20000)
+        parser.add_argument('--comments', type=int, default=40000)
+        parser.add_argument('--users', type=int)
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.1,
+            help='Неравномерность популярности произведений, '
+                 'см. generate_data.'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Зерно генератора данных и выбора произведений.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Сколько замеров делать для каждого сценария.'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=2,
+            help='Сколько прогонов сценария не учитывать.'
+        )
+        parser.add_argument(
+            '--only',
+            nargs='+',
+            metavar='SCENARIO',
+            help='Замерить только перечисленные сценарии.'
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл для результата; по умолчанию '
+                 'benchmark-<СУБД>-<время>.json в текущем каталоге.'
+        )
+        parser.add_argument(
+            '--keepdb',
+            action='store_true',
+            help='Не удалять тестовую базу и переиспользовать данные в ней.'
+        )
+
+    def handle(self, *args, **options):
+        if min(options['titles'], options['reviews'],
+               options['comments'], options['repeat']) < 1:
+            raise CommandError(
+                'Размеры данных и число замеров должны быть положительными.'
+            )
+        connection = connections[DEFAULT_DB_ALIAS]
+        old_name = connection.settings_dict['NAME']
+        setup_test_environment()
+        connection.creation.create_test_db(
+            verbosity=options['verbosity'],
+            autoclobber=True,
+            keepdb=options['keepdb'],
+        )
+        try:
+            result = self.run_benchmark(options)
+        finally:
+            connection.creation.destroy_test_db(
+                old_name, options['verbosity'], options['keepdb']
+            )
+            teardown_test_environment()
+        path = options['output'] or 'benchmark-{vendor}-{time}.json'.format(
+            vendor=result['environment']['vendor'],
+            time=datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S'),
+        )
+        with open(path, 'w', encoding='utf-8') as stream:
+            json.dump(result, stream, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(
+            f'Результат сохранён в {os.path.abspath(path)}'
+        ))
+
+    def run_benchmark(self, options):
+        if not Title.objects.exists():
+            self.stdout.write('Заполнение базы...')
+            try:
+                generator = DataGenerator(
+                    options['titles'], options['reviews'],
+                    options['comments'],
+                    users=options['users'],
+                    skew=options['skew'],
+                    seed=options['seed'],
+                )
+            except ValueError as error:
+                raise CommandError(str(error))
+            generator.run()
+        dataset = dataset_size()
+        benchmark = Benchmark(
+            repeat=options['repeat'],
+            warmup=options['warmup'],
+            seed=options['seed'],
+        )
+        try:
+            results = benchmark.run(only=options['only'])
+            rendering = RenderingBenchmark(repeat=options['repeat']).run()
+        except BenchmarkError as error:
+            raise CommandError(str(error))
+        for name, stats in results.items():
+            self.stdout.write(
+                f'{name:<26} медиана {stats["median_ms"]:>9.2f} мс  '
+                f'p95 {stats["p95_ms"]:>9.2f} мс  '
+                f'запросов {stats["queries"]}'
+            )
+        for name, stats in rendering.items():
+            self.stdout.write(
+                f'{name:<28} байт {stats["bytes"]}  мс {stats["ms"]}'
+            )
+        return {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'environment': environment(),
+            'dataset': dataset,
+            'options': {
+                key: options[key]
+                for key in ('seed', 'skew', 'repeat', 'warmup')
+            },
+            'results': results,
+            'rendering': rendering,
+        }
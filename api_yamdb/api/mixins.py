@@ -0,0 +1,33 @@
+from django.shortcuts import get_object_or_404
+from reviews.models import Review, Title
+
+
+class NestedParentMixin:
+    """Карта объектов-родителей вложенного маршрута на время запроса.
+
+    Произведение и отзыв из ``title_id`` и ``review_id`` загружаются
+    не больше одного раза; отзыв загружается вместе с произведением
+    одним запросом, который заодно проверяет их связь. Отзывы
+    удалённых авторов не находятся, как и удалённые произведения.
+    """
+
+    def get_title(self):
+        if not hasattr(self, '_parent_title'):
+            if 'review_id' in self.kwargs:
+                self._parent_title = self.get_review().title
+            else:
+                self._parent_title = get_object_or_404(
+                    Title, pk=self.kwargs.get('title_id')
+                )
+        return self._parent_title
+
+    def get_review(self):
+        if not hasattr(self, '_parent_review'):
+            self._parent_review = get_object_or_404(
+                Review.objects.select_related('title'),
+                pk=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id'),
+                title__is_deleted=False,
+                author__is_deleted=False,
+            )
+        return self._parent_review
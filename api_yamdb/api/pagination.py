@@ -0,0 +1,39 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class PubDateCursorPagination(CursorPagination):
+    """Курсорная навигация по дате публикации с уточнением по id."""
+    ordering = ('-pub_date', '-id')
+
+
+class PubDatePagination(PageNumberPagination):
+    """Постраничная навигация с курсорным режимом по запросу.
+
+    Курсорный режим включается параметром ``?pagination=cursor`` или
+    переданным ``?cursor=``: стоимость страницы тогда не зависит
+    от её номера, потому что вместо OFFSET и COUNT(*) выборка
+    продолжается от даты публикации последней записи.
+    """
+    mode_query_param = 'pagination'
+    cursor_class = PubDateCursorPagination
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor = None
+        if not self.use_cursor(request):
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor = self.cursor_class()
+        self.cursor.ordering = getattr(
+            view, 'cursor_ordering', self.cursor.ordering
+        )
+        return self.cursor.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor is None:
+            return super().get_paginated_response(data)
+        return self.cursor.get_paginated_response(data)
@@ -1,8 +1,56 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from rest_framework import serializers
-from rest_framework.validators import ValidationError
+from rest_framework.validators import UniqueValidator, ValidationError
 from reviews.models import Category, Comment, Genre, Review, Title, User
 from reviews.validators import username_validate
 
+from .fieldsets import FieldsetSerializerMixin
+
+USER_EXISTS_MESSAGE = 'Пользователь с таким username или email уже существует.'
+USER_DELETED_MESSAGE = (
+    'Пользователь с таким username или email удалён, '
+    'его данные ещё не стёрты.'
+)
+USERS_BULK_LIMIT = 500
+LEADERBOARD_LIMIT = 100
+REVIEW_EXISTS_MESSAGE = 'Больше одного отзыва оставлять нельзя.'
+
+
+class UserListSerializer(serializers.ListSerializer):
+    """Проверяет и создаёт пачку пользователей за один запрос к БД."""
+
+    def validate(self, data):
+        if len(data) > USERS_BULK_LIMIT:
+            raise ValidationError(
+                f'За один запрос можно создать не более '
+                f'{USERS_BULK_LIMIT} пользователей.'
+            )
+        usernames = [item['username'] for item in data]
+        emails = [item['email'] for item in data]
+        if (
+            len(set(usernames)) != len(usernames)
+            or len(set(emails)) != len(emails)
+        ):
+            raise ValidationError('username и email не должны повторяться.')
+        taken = User.all_objects.filter(
+            Q(username__in=usernames) | Q(email__in=emails)
+        ).order_by().values_list('username', flat=True)
+        if taken:
+            raise ValidationError(
+                f'{USER_EXISTS_MESSAGE} ({", ".join(taken)})'
+            )
+        return data
+
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return User.objects.bulk_create(
+                    User(**item) for item in validated_data
+                )
+        except IntegrityError:
+            raise ValidationError(USER_EXISTS_MESSAGE)
+
 
 class UserSerializer(serializers.ModelSerializer):
     username = serializers.CharField(required=True)
@@ -17,6 +65,8 @@ class UserSerializer(serializers.ModelSerializer):
             'bio',
             'role'
         )
+        extra_kwargs = {'email': {'validators': ()}}
+        list_serializer_class = UserListSerializer
 
     def validate_username(self, value):
         if value == 'me':
@@ -26,14 +76,30 @@ class UserSerializer(serializers.ModelSerializer):
         return value
 
     def validate(self, data):
-        if self.context['request'].POST:
-            sources = list(User.objects.values('username', 'email'))
-            for item in sources:
-                for field in set(item.items()):
-                    if field in set(data.items()):
-                        raise ValidationError('error')
+        if (
+            self.instance is None
+            and self.parent is None
+            and User.all_objects.filter(
+                Q(username=data['username']) | Q(email=data['email'])
+            ).exists()
+        ):
+            raise ValidationError(USER_EXISTS_MESSAGE)
         return data
 
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise ValidationError(USER_EXISTS_MESSAGE)
+
+    def update(self, instance, validated_data):
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError:
+            raise ValidationError(USER_EXISTS_MESSAGE)
+
 
 class ProfileEditSerializer(serializers.ModelSerializer):
     class Meta:
@@ -47,6 +113,15 @@ class ProfileEditSerializer(serializers.ModelSerializer):
         )
         model = User
         read_only_fields = ('role',)
+        # Имена и почта удалённых, но ещё не стёртых пользователей заняты.
+        extra_kwargs = {
+            'username': {'validators': (
+                username_validate, UniqueValidator(User.all_objects.all())
+            )},
+            'email': {'validators': (
+                UniqueValidator(User.all_objects.all()),
+            )},
+        }
 
     def validate_username(self, value):
         if value == 'me':
@@ -92,14 +167,19 @@ class SignUpSerializer(serializers.Serializer):
     def validate(self, data):
         username = data.get('username')
         email = data.get('email')
-        if (
-            User.objects.filter(username=username).exists()
-            and User.objects.get(username=username).email != email
+        users = User.all_objects.filter(
+            Q(username=username) | Q(email=email)
+        ).values_list('username', 'email', 'is_deleted')
+        if any(is_deleted for *_, is_deleted in users):
+            raise serializers.ValidationError(USER_DELETED_MESSAGE)
+        if any(
+            name == username and address != email
+            for name, address, _ in users
         ):
             raise serializers.ValidationError("Пользователь существует!")
-        if (
-            User.objects.filter(email=email).exists()
-            and User.objects.get(email=email).username != username
+        if any(
+            address == email and name != username
+            for name, address, _ in users
         ):
             raise serializers.ValidationError("Емайл существует!")
         return data
@@ -109,7 +189,8 @@ class SignUpSerializer(serializers.Serializer):
         fields = ('username', 'email')
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(FieldsetSerializerMixin,
+                        serializers.ModelSerializer):
     author = serializers.SlugRelatedField(read_only=True,
                                           slug_field='username')
 
@@ -118,7 +199,8 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'pub_date')
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(FieldsetSerializerMixin,
+                       serializers.ModelSerializer):
     author = serializers.SlugRelatedField(read_only=True,
                                           slug_field='username')
 
@@ -127,21 +209,11 @@ class ReviewSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError('Проверьте оценку!')
         return value
 
-    def validate(self, data):
-        current_user = self.context['request'].user
-        title_id = self.context['view'].kwargs.get('title_id')
-        if (
-            current_user.reviews.filter(title=title_id).exists()
-            and self.context['request'].method == 'POST'
-        ):
-            raise serializers.ValidationError(
-                'Больше одного отзыва оставлять нельзя.'
-            )
-        return data
-
     class Meta:
         model = Review
-        fields = ('id', 'text', 'author', 'score', 'pub_date')
+        fields = (
+            'id', 'text', 'author', 'score', 'pub_date', 'comments_count'
+        )
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -173,16 +245,27 @@ class TitleSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        fields = (
+            'id', 'name', 'year', 'rating', 'reviews_count', 'description',
+            'genre', 'category'
+        )
 
 
-class ReadOnlyTitleSerializer(serializers.ModelSerializer):
-    rating = serializers.IntegerField(read_only=True)
+class ReadOnlyTitleSerializer(FieldsetSerializerMixin,
+                              serializers.ModelSerializer):
+    rating = serializers.IntegerField(read_only=True, allow_null=True)
     genre = GenreSerializer(many=True)
     category = CategorySerializer()
 
     class Meta:
         model = Title
         fields = (
-            'id', 'name', 'year', 'rating', 'description', 'genre', 'category'
+            'id', 'name', 'year', 'rating', 'reviews_count', 'description',
+            'genre', 'category'
         )
+
+
+class LeaderboardSerializer(serializers.Serializer):
+    limit = serializers.IntegerField(
+        min_value=1, max_value=LEADERBOARD_LIMIT, default=10
+    )
@@ -0,0 +1,68 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_save)
+from django.dispatch import receiver
+from reviews.models import Category, Genre, GenreTitle, Review, Title, User
+from reviews.signals import catalog_imported, reviews_purged
+
+from .authentication import user_cache, user_dependency
+from .cache import bump_versions, title_dependency
+
+
+@receiver((post_save, post_delete), sender=Category)
+def invalidate_categories(sender, **kwargs):
+    bump_versions('category')
+
+
+@receiver((post_save, post_delete), sender=Genre)
+def invalidate_genres(sender, **kwargs):
+    bump_versions('genre')
+
+
+@receiver((post_save, post_delete), sender=Title)
+def invalidate_title(sender, instance, **kwargs):
+    bump_versions('title', title_dependency(instance.pk))
+
+
+@receiver((post_save, post_delete), sender=GenreTitle)
+def invalidate_title_genres(sender, instance, **kwargs):
+    bump_versions('title', title_dependency(instance.title_id))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genre_set(sender, instance, action, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if isinstance(instance, Title):
+        title_ids = (instance.pk,)
+    else:
+        title_ids = pk_set or ()
+    bump_versions('title', *map(title_dependency, title_ids))
+
+
+@receiver(pre_save, sender=Review)
+def invalidate_previous_title_rating(sender, instance, **kwargs):
+    previous = getattr(instance, '_rating_state', None)
+    if previous is not None and previous[0] != instance.title_id:
+        bump_versions(title_dependency(previous[0]))
+
+
+@receiver((post_save, post_delete), sender=Review)
+def invalidate_title_rating(sender, instance, **kwargs):
+    bump_versions('title', title_dependency(instance.title_id))
+
+
+@receiver(reviews_purged)
+def invalidate_purged_ratings(sender, title_ids, **kwargs):
+    bump_versions('title', *map(title_dependency, title_ids))
+
+
+@receiver((post_save, post_delete), sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+    bump_versions(user_dependency(instance.pk))
+
+
+@receiver(catalog_imported)
+def invalidate_imported(sender, **kwargs):
+    bump_versions('title', 'category', 'genre')
+    user_cache.clear()
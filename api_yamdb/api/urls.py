@@ -1,8 +1,9 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import (APIGetToken, APISignup, CategoryViewSet, CommentViewSet,
-                    GenreViewSet, ReviewViewSet, TitleViewSet, UserViewSet)
+from .views import (APIDatabaseDiagnostics, APIGetToken, APISignup,
+                    CategoryViewSet, CommentViewSet, GenreViewSet,
+                    ReviewViewSet, TitleViewSet, UserViewSet)
 
 router_v1 = DefaultRouter()
 
@@ -28,6 +29,11 @@ urlpatterns = [
         path('auth/', include([
             path('signup/', APISignup.as_view(), name='signup'),
             path('token/', APIGetToken.as_view(), name='token'),
-        ]))
+        ])),
+        path(
+            'diagnostics/db/',
+            APIDatabaseDiagnostics.as_view(),
+            name='db-diagnostics'
+        ),
     ]))
 ]
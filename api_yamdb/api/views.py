@@ -1,28 +1,46 @@
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import AccessToken
-from reviews.models import Category, Genre, Review, Title, User
+from reviews.models import Category, Genre, Title, User
+from reviews.outbox import enqueue_email
+from reviews.purge import purge_comments
+from reviews.ratings import top_titles
 
-from .filters import TitlesFilter
+from .cache import CachedResponseMixin, title_dependency
+from .db_pool import get_diagnostics
+from .export import EXPORT_FORMATS, iter_titles
+from .fastpath import ValuesListMixin
+from .fieldsets import SparseFieldsetMixin
+from .filters import TitleOrderingFilter, TitlesFilter
+from .mixins import NestedParentMixin
+from .pagination import PubDatePagination
 from .permissions import (IsAdmin, IsAdminModeratorOwnerOrReadOnly,
                           IsAdminOrReadOnly)
-from .serializers import (CategorySerializer, CommentSerializer,
-                          GenreSerializer, GetTokenSerializer,
+from .serializers import (REVIEW_EXISTS_MESSAGE, CategorySerializer,
+                          CommentSerializer, GenreSerializer,
+                          GetTokenSerializer, LeaderboardSerializer,
                           ProfileEditSerializer, ReadOnlyTitleSerializer,
                           ReviewSerializer, SignUpSerializer, TitleSerializer,
                           UserSerializer)
 
+TITLES_BATCH_LIMIT = 200
+# Больше не помещается в BIGINT: база ответила бы ошибкой, а не пустотой.
+MAX_ID = 2 ** 63 - 1
 
-class CategoryViewSet(mixins.ListModelMixin,
+
+class CategoryViewSet(CachedResponseMixin,
+                      mixins.ListModelMixin,
                       mixins.CreateModelMixin,
                       mixins.DestroyModelMixin,
                       viewsets.GenericViewSet):
@@ -32,9 +50,11 @@ class CategoryViewSet(mixins.ListModelMixin,
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
+    cache_dependencies = ('category',)
 
 
-class GenreViewSet(mixins.ListModelMixin,
+class GenreViewSet(CachedResponseMixin,
+                   mixins.ListModelMixin,
                    mixins.CreateModelMixin,
                    mixins.DestroyModelMixin,
                    viewsets.GenericViewSet):
@@ -44,20 +64,98 @@ class GenreViewSet(mixins.ListModelMixin,
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
+    cache_dependencies = ('genre',)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all().annotate(rating=Avg('reviews__score',))
+class TitleViewSet(CachedResponseMixin, SparseFieldsetMixin, ValuesListMixin,
+                   viewsets.ModelViewSet):
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
     serializer_class = TitleSerializer
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, TitleOrderingFilter)
     filterset_class = TitlesFilter
+    ordering_fields = ('rating', 'reviews_count', 'year', 'name')
+    cache_dependencies = ('title', 'category', 'genre')
+
+    def get_cache_dependencies(self, action, **kwargs):
+        if action == 'retrieve':
+            return ('category', 'genre', title_dependency(kwargs['pk']))
+        return self.cache_dependencies
 
     def get_serializer_class(self):
         if self.action in ('retrieve', 'list'):
             return ReadOnlyTitleSerializer
         return TitleSerializer
 
+    def perform_destroy(self, instance):
+        instance.soft_delete()
+
+    @action(detail=False, methods=['GET'])
+    def top(self, request):
+        params = LeaderboardSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        serializer = ReadOnlyTitleSerializer(
+            top_titles(
+                self.filter_queryset(self.get_queryset()),
+                params.validated_data['limit']
+            ),
+            many=True,
+            context=self.get_serializer_context()
+        )
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['GET'])
+    def batch(self, request):
+        try:
+            ids = list(dict.fromkeys(
+                int(value)
+                for value in request.query_params.get('ids', '').split(',')
+                if value
+            ))
+            if not all(0 < pk <= MAX_ID for pk in ids):
+                raise ValueError
+        except ValueError:
+            return Response(
+                {'ids': 'Укажите id произведений через запятую.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not ids or len(ids) > TITLES_BATCH_LIMIT:
+            return Response(
+                {'ids': f'Можно запросить от 1 до {TITLES_BATCH_LIMIT} '
+                        f'произведений.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        titles = self.get_queryset().in_bulk(ids)
+        serializer = ReadOnlyTitleSerializer(
+            [titles[pk] for pk in ids if pk in titles],
+            many=True,
+            context=self.get_serializer_context()
+        )
+        return Response({
+            'results': serializer.data,
+            'missing': [pk for pk in ids if pk not in titles],
+        })
+
+    @action(detail=False, methods=['GET'], permission_classes=(IsAdmin,))
+    def export(self, request):
+        export_format = request.query_params.get('type', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'type': f'Доступные форматы: {", ".join(EXPORT_FORMATS)}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        serialize, content_type = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(
+            serialize(iter_titles(self.filter_queryset(self.get_queryset()))),
+            content_type=content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="titles.{export_format}"'
+        )
+        return response
+
 
 class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
@@ -67,6 +165,9 @@ class UserViewSet(viewsets.ModelViewSet):
     filter_backends = (filters.SearchFilter,)
     search_fields = ('username',)
 
+    def perform_destroy(self, instance):
+        instance.soft_delete()
+
     @action(
         detail=False,
         methods=['GET', 'PATCH'],
@@ -86,6 +187,13 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer = UserSerializer(user)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['POST'])
+    def bulk(self, request):
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
 
 class APIGetToken(APIView):
     permission_classes = (AllowAny,)
@@ -104,7 +212,7 @@ class APIGetToken(APIView):
                                                data['confirmation_code']):
             token = AccessToken.for_user(user)
             return Response(
-                {'token': token},
+                {'token': str(token)},
                 status=status.HTTP_201_CREATED
             )
         return Response(
@@ -131,43 +239,72 @@ class APISignup(APIView):
             'recipient_list': (user.email,),
             'subject': 'Код подтверждения для доступа к API!'
         }
-        send_mail(**data)
+        enqueue_email(**data)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class APIDatabaseDiagnostics(APIView):
+    permission_classes = (IsAdmin,)
+
+    def get(self, request):
+        return Response(get_diagnostics())
+
+
+class ReviewViewSet(NestedParentMixin, SparseFieldsetMixin, ValuesListMixin,
+                    viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = (IsAdminModeratorOwnerOrReadOnly,)
+    pagination_class = PubDatePagination
+    cursor_ordering = ('-pub_date', '-id')
 
     def get_serializer_context(self):
         context = super(ReviewViewSet, self).get_serializer_context()
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        context.update({'title': title})
+        context.update({'title': self.get_title()})
         return context
 
     def get_queryset(self):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        return title.reviews.all()
+        # Менеджер связи сверяет title_id каждой строки с произведением.
+        return self.apply_fieldset(
+            self.get_title().reviews.filter(
+                author__is_deleted=False
+            ).select_related('author'),
+            keep=('title',)
+        )
 
     def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        serializer.save(author=self.request.user, title=title)
-        return title.reviews.all()
+        try:
+            with transaction.atomic():
+                serializer.save(
+                    author=self.request.user, title=self.get_title()
+                )
+        except IntegrityError:
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [REVIEW_EXISTS_MESSAGE]
+            })
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        # Комментарии пачкой: каскад сдвигал бы счётчик отзыва
+        # отдельным UPDATE на каждый комментарий.
+        purge_comments(instance.comments.all(), settings.PURGE_BATCH_SIZE)
+        instance.delete()
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(NestedParentMixin, SparseFieldsetMixin,
+                     ValuesListMixin, viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = (IsAdminModeratorOwnerOrReadOnly,)
+    pagination_class = PubDatePagination
+    cursor_ordering = ('pub_date', 'id')
     http_method_names = ('get', 'post', 'patch', 'delete')
 
     def get_queryset(self):
-        review = get_object_or_404(Review, pk=self.kwargs.get('review_id'))
-        return review.comments.all()
+        return self.apply_fieldset(
+            self.get_review().comments.filter(
+                author__is_deleted=False
+            ).select_related('author'),
+            keep=('review',)
+        )
 
     def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, id=review_id, title=title_id)
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.get_review())
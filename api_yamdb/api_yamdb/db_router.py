@@ -0,0 +1,44 @@
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+routing_state = ContextVar('routing_state', default=None)
+
+
+class RoutingState:
+    """Решение о реплике для одного запроса."""
+
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+class PrimaryReplicaRouter:
+    """Чтение безопасных запросов с реплики, всё остальное с основной БД.
+
+    Реплика используется, только пока ``ReplicaRoutingMiddleware``
+    разрешила её для текущего запроса, запрос ещё ничего не записал
+    и основная БД не находится внутри транзакции.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = routing_state.get()
+        if (
+            settings.REPLICA_DATABASE
+            and state is not None
+            and state.use_replica
+            and not state.wrote
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return settings.REPLICA_DATABASE
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = routing_state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
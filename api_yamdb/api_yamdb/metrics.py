@@ -0,0 +1,75 @@
+import os
+
+from django.http import HttpResponse
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY,
+                               CollectorRegistry, Counter, Histogram,
+                               generate_latest, multiprocess)
+
+METHODS = ('GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE')
+
+REQUESTS = Counter(
+    'yamdb_http_requests_total',
+    'Число обработанных HTTP-запросов.',
+    ('view', 'method', 'status'),
+)
+REQUEST_LATENCY = Histogram(
+    'yamdb_http_request_duration_seconds',
+    'Время обработки HTTP-запроса.',
+    ('view', 'method', 'status'),
+)
+DB_QUERIES = Histogram(
+    'yamdb_db_queries_per_request',
+    'Число запросов к БД за один HTTP-запрос.',
+    ('view',),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200, float('inf')),
+)
+CACHE_REQUESTS = Counter(
+    'yamdb_cache_requests_total',
+    'Обращения к кэшам приложения.',
+    ('cache', 'result'),
+)
+
+
+def view_label(view_func, method):
+    """Имя представления вида ``TitleViewSet.list`` или ``APISignup``."""
+    view_class = getattr(view_func, 'cls', None) or getattr(
+        view_func, 'view_class', None
+    )
+    if view_class is None:
+        return f'{view_func.__module__}.{view_func.__name__}'
+    actions = getattr(view_func, 'actions', None)
+    if actions and method.lower() in actions:
+        return f'{view_class.__name__}.{actions[method.lower()]}'
+    return view_class.__name__
+
+
+def observe_request(view, method, status, duration, queries):
+    if method not in METHODS:
+        method = 'other'
+    status = str(status)
+    REQUESTS.labels(view, method, status).inc()
+    REQUEST_LATENCY.labels(view, method, status).observe(duration)
+    DB_QUERIES.labels(view).observe(queries)
+
+
+def observe_cache(cache, hit):
+    CACHE_REQUESTS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def get_registry():
+    """Реестр для выдачи: под gunicorn собирает значения всех воркеров.
+
+    В многопроцессном режиме каждый воркер пишет метрики в файлы
+    каталога ``PROMETHEUS_MULTIPROC_DIR``, а ответ собирается из них.
+    """
+    if not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_view(request):
+    return HttpResponse(
+        generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST
+    )
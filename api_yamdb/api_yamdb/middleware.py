@@ -0,0 +1,300 @@
+import hashlib
+import heapq
+import json
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, compress_string
+from rest_framework.serializers import ListSerializer, Serializer
+
+from .db_router import RoutingState, routing_state
+from .metrics import observe_request, view_label
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+logger = logging.getLogger(__name__)
+
+request_timings = ContextVar('request_timings', default=None)
+
+
+class ReplicaRoutingMiddleware:
+    """Направляет чтение безопасных запросов на реплику.
+
+    После записи клиент на ``REPLICA_PIN_SECONDS`` секунд закрепляется
+    за основной БД, чтобы видеть свои изменения, пока реплика
+    догоняет. Клиент определяется по заголовку авторизации или
+    сессии; анонимные клиенты не закрепляются: за nginx у всех
+    них один адрес, и регистрация одного уводила бы на основную БД
+    чтение всех остальных.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def get_pin_key(self, request):
+        """Ключ закрепления клиента или ``None`` для анонимного."""
+        client = (
+            request.META.get('HTTP_AUTHORIZATION')
+            or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        )
+        if not client:
+            return None
+        return 'db:pin:' + hashlib.md5(client.encode()).hexdigest()
+
+    def __call__(self, request):
+        if not settings.REPLICA_DATABASE:
+            return self.get_response(request)
+        pin_key = self.get_pin_key(request)
+        state = RoutingState(
+            use_replica=request.method in SAFE_METHODS and not (
+                pin_key and cache.get(pin_key)
+            )
+        )
+        token = routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        if pin_key and (state.wrote or request.method not in SAFE_METHODS):
+            cache.set(pin_key, True, settings.REPLICA_PIN_SECONDS)
+        return response
+
+
+class RequestTimings:
+    """Запросы к БД и время сериализации одного HTTP-запроса."""
+
+    def __init__(self):
+        self.queries = []
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.db_time += duration
+            self.queries.append((duration, sql))
+
+    def slowest_queries(self, count):
+        return heapq.nlargest(count, self.queries, key=lambda query: query[0])
+
+
+@contextmanager
+def serializer_timing():
+    """Засчитывает время блока как время сериализации запроса.
+
+    Вложенные блоки (``ListSerializer`` и его дочерний сериализатор)
+    учитываются один раз — во внешнем.
+    """
+    timings = request_timings.get()
+    if timings is None or timings.serializing:
+        yield
+        return
+    timings.serializing = True
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.serializing = False
+        timings.serializer_time += time.perf_counter() - start
+
+
+def timed_data(data):
+    """Оборачивает свойство ``data`` сериализатора замером времени."""
+    def wrapper(serializer):
+        with serializer_timing():
+            return data.fget(serializer)
+
+    wrapper.timed = True
+    return property(wrapper)
+
+
+def instrument_serializers():
+    for serializer_class in (Serializer, ListSerializer):
+        data = serializer_class.__dict__['data']
+        if not getattr(data.fget, 'timed', False):
+            serializer_class.data = timed_data(data)
+
+
+class RequestTimingMiddleware:
+    """Считает запросы к БД, время БД, сериализации и всего запроса.
+
+    Итог отдаётся в заголовке ``Server-Timing``; запросы дольше
+    ``SLOW_REQUEST_MS`` пишутся в лог вместе с самыми медленными
+    SQL-запросами. При выключенном ``REQUEST_TIMING`` middleware
+    не подключается вовсе.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_TIMING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        instrument_serializers()
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings))
+                response = self.get_response(request)
+        finally:
+            request_timings.reset(token)
+        total = time.perf_counter() - start
+        response['Server-Timing'] = (
+            'db;dur={:.1f};desc="{} queries", serializer;dur={:.1f}, '
+            'view;dur={:.1f}'.format(
+                timings.db_time * 1000, len(timings.queries),
+                timings.serializer_time * 1000, total * 1000,
+            )
+        )
+        if total * 1000 >= settings.SLOW_REQUEST_MS:
+            self.log_slow_request(request, response, timings, total)
+        return response
+
+    def log_slow_request(self, request, response, timings, total):
+        logger.warning(json.dumps({
+            'event': 'slow_request',
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 1),
+            'db_ms': round(timings.db_time * 1000, 1),
+            'serializer_ms': round(timings.serializer_time * 1000, 1),
+            'queries': len(timings.queries),
+            'slowest_queries': [
+                {'ms': round(duration * 1000, 1), 'sql': sql}
+                for duration, sql in timings.slowest_queries(
+                    settings.SLOW_REQUEST_TOP_QUERIES
+                )
+            ],
+        }, ensure_ascii=False))
+
+
+class QueryCounter:
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class PrometheusMiddleware:
+    """Пишет время, статус и число запросов к БД в метрики Prometheus.
+
+    Метка представления вычисляется в ``process_view``; запросы,
+    не сопоставленные ни одному маршруту, учитываются как ``unresolved``.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROMETHEUS_METRICS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(queries))
+            response = self.get_response(request)
+        observe_request(
+            getattr(request, 'metrics_view', 'unresolved'),
+            request.method,
+            response.status_code,
+            time.perf_counter() - start,
+            queries.count,
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics_view = view_label(view_func, request.method)
+
+
+def accepted_encodings(header):
+    """Кодировки из ``Accept-Encoding`` с ненулевым весом."""
+    accepted = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1.0
+        name, _, value = params.strip().partition('=')
+        if name.strip() == 'q':
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class CompressionMiddleware:
+    """Сжимает ответы brotli или gzip по ``Accept-Encoding`` клиента.
+
+    Ответы короче ``COMPRESSION_MIN_SIZE`` байт отдаются как есть:
+    выигрыш на них меньше затрат процессора. Brotli выбирается, если
+    клиент его принимает и установлен пакет ``brotli``; потоковые
+    ответы сжимаются gzip, как в ``GZipMiddleware``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.has_header('Content-Encoding') or (
+            not response.streaming
+            and len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accepted = accepted_encodings(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if response.streaming:
+            if 'gzip' not in accepted:
+                return response
+            response.streaming_content = compress_sequence(
+                response.streaming_content
+            )
+            del response['Content-Length']
+            return self.mark_encoded(response, 'gzip')
+        if brotli is not None and 'br' in accepted:
+            encoding, content = 'br', brotli.compress(
+                response.content, quality=settings.BROTLI_QUALITY
+            )
+        elif 'gzip' in accepted:
+            encoding, content = 'gzip', compress_string(response.content)
+        else:
+            return response
+        if len(content) >= len(response.content):
+            return response
+        response.content = content
+        response['Content-Length'] = str(len(content))
+        return self.mark_encoded(response, encoding)
+
+    def mark_encoded(self, response, encoding):
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
@@ -29,13 +29,18 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework_simplejwt',
     'django_filters',
+    'import_export',
 
     'reviews',
     'api',
 ]
 
 MIDDLEWARE = [
+    'api_yamdb.middleware.PrometheusMiddleware',
+    'api_yamdb.middleware.RequestTimingMiddleware',
+    'api_yamdb.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api_yamdb.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -44,6 +49,18 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+REQUEST_TIMING = os.getenv('REQUEST_TIMING', default='0') == '1'
+
+SLOW_REQUEST_MS = int(os.getenv('SLOW_REQUEST_MS', default=500))
+
+SLOW_REQUEST_TOP_QUERIES = 5
+
+PROMETHEUS_METRICS = os.getenv('PROMETHEUS_METRICS', default='1') == '1'
+
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', default=1024))
+
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', default=4))
+
 ROOT_URLCONF = 'api_yamdb.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
@@ -65,6 +82,31 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', default='yamdb'),
+    }
+}
+
+API_CACHE_ALIAS = 'default'
+
+# Кэш ответов и закрепление за основной БД полагаются на кэш, общий
+# для всех процессов gunicorn: версии моделей, сдвинутые одним
+# процессом, должны видеть остальные. Локальный кэш по умолчанию
+# у каждого процесса свой, поэтому без CACHE_BACKEND (memcached,
+# DatabaseCache и т. п.) кэш ответов выключен.
+SHARED_CACHE = 'locmem' not in CACHES['default']['BACKEND'].lower()
+
+API_CACHE_TIMEOUT = int(os.getenv(
+    'API_CACHE_TIMEOUT', default=300 if SHARED_CACHE else 0
+))
+
 # Database
 
 DATABASES = {
@@ -75,12 +117,40 @@ DATABASES = {
         'USER': os.getenv('POSTGRES_USER'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
-        'PORT': os.getenv('DB_PORT')
+        'PORT': os.getenv('DB_PORT'),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', default=60)),
     }
 }
 
+DB_HEALTH_CHECKS = os.getenv('DB_HEALTH_CHECKS', default='1') == '1'
+
+# Соединение, занятое недавно, не проверяется лишним SELECT 1:
+# упавшие в запросе соединения Django закрывает и так.
+DB_HEALTH_CHECK_IDLE = int(os.getenv('DB_HEALTH_CHECK_IDLE', default=30))
+
+if os.getenv('DB_REPLICA_HOST') or os.getenv('DB_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv('DB_REPLICA_NAME', DATABASES['default']['NAME']),
+        'HOST': os.getenv('DB_REPLICA_HOST', DATABASES['default']['HOST']),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# Закрепление за основной БД после записи хранится в кэше, поэтому
+# реплика используется только с общим для всех процессов кэшем.
+REPLICA_DATABASE = (
+    'replica' if 'replica' in DATABASES and SHARED_CACHE else None
+)
+
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', default=5))
+
+DATABASE_ROUTERS = ['api_yamdb.db_router.PrimaryReplicaRouter']
+
 DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 
+LEADERBOARD_MIN_REVIEWS = int(os.getenv('LEADERBOARD_MIN_REVIEWS', default=3))
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -123,9 +193,23 @@ EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 DEFAULT_FROM_EMAIL = 'admin@yamdb.com'
 
+OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', default=100))
+
+OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', default=5))
+
+OUTBOX_RETRY_DELAY = int(os.getenv('OUTBOX_RETRY_DELAY', default=60))
+
+PURGE_BATCH_SIZE = int(os.getenv('PURGE_BATCH_SIZE', default=1000))
+
+ADMIN_COUNT_LIMIT = int(os.getenv('ADMIN_COUNT_LIMIT', default=10000))
+
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.CachedUserJWTAuthentication",
     ],
 
     'DEFAULT_PERMISSION_CLASSES': [
@@ -141,5 +225,27 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Другие процессы узнают об изменении пользователя только через общий
+# кэш; без него роль и активность сверяются с БД на каждый запрос.
+JWT_USER_CACHE_SIZE = int(os.getenv(
+    'JWT_USER_CACHE_SIZE', default=10000 if SHARED_CACHE else 0
+))
+
+JWT_USER_CACHE_TTL = int(os.getenv('JWT_USER_CACHE_TTL', default=60))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'api_yamdb.middleware': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+    },
+}
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
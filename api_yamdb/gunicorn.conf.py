@@ -0,0 +1,17 @@
+import os
+import shutil
+
+# Метрики воркеров складываются в общий каталог, см. api_yamdb.metrics.
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/yamdb-metrics')
+
+
+def on_starting(server):
+    path = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
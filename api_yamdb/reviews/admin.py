@@ -1,11 +1,94 @@
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth.models import Group
+from django.core.paginator import Paginator
 from django.db import models
+from django.db.models import Q
+from django.utils.functional import cached_property
 from import_export import resources
 from import_export.admin import ImportExportModelAdmin
 from import_export.fields import Field
 from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
                             Title, User)
+from reviews.search import get_title_search
+
+
+class LargeTablePaginator(Paginator):
+    """Paginator без точного ``COUNT(*)`` по всей выборке.
+
+    Считается не больше ``ADMIN_COUNT_LIMIT`` строк: дальше листать
+    большую таблицу бессмысленно, для этого есть поиск и фильтры.
+    """
+
+    @cached_property
+    def count(self):
+        return self.object_list.order_by()[:settings.ADMIN_COUNT_LIMIT].count()
+
+
+class LargeTableAdminMixin:
+    """Список большой таблицы без полных подсчётов и обходов таблицы.
+
+    Общее число строк не считается, количество найденных ограничено
+    ``LargeTablePaginator``, а сортировка по первичному ключу читает
+    индекс. Поиск идёт только по индексам: число ищется точным
+    совпадением в ``id_search_fields``, текст — по ``search_fields``,
+    где допустимы только индексируемые запросы.
+    """
+    paginator = LargeTablePaginator
+    show_full_result_count = False
+    ordering = ('-pk',)
+    id_search_fields = ('pk',)
+
+    def get_search_fields(self, request):
+        # Без search_fields Django не показывает строку поиска.
+        return self.search_fields or self.id_search_fields
+
+    def search_text(self, request, queryset, search_term):
+        """Поиск по тексту; ``None``, если искать текст негде."""
+        if not self.search_fields:
+            return None
+        return super().get_search_results(request, queryset, search_term)[0]
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        matched = self.search_text(request, queryset, term)
+        if not term.isdigit():
+            return (queryset.none() if matched is None else matched), False
+        found = queryset.filter(reduce(or_, (
+            Q(**{name: int(term)}) for name in self.id_search_fields
+        )))
+        if matched is not None:
+            found |= matched
+        return found, False
+
+
+class SoftDeleteAdminMixin:
+    """Удаление из админки пометкой, как и через API.
+
+    Страница подтверждения не обходит каскад отзывов и комментариев:
+    их потом удаляет команда ``purge_deleted``.
+    """
+
+    def get_deleted_objects(self, objs, request):
+        objs = list(objs)
+        return (
+            [str(obj) for obj in objs],
+            {self.model._meta.verbose_name_plural: len(objs)},
+            set(),
+            [],
+        )
+
+    def delete_model(self, request, obj):
+        obj.soft_delete()
+
+    def delete_queryset(self, request, queryset):
+        for obj in queryset.iterator():
+            obj.soft_delete()
 
 
 class UserResource(resources.ModelResource):
@@ -23,7 +106,8 @@ class UserResource(resources.ModelResource):
         )
 
 
-class UserAdmin(ImportExportModelAdmin,):
+class UserAdmin(LargeTableAdminMixin, SoftDeleteAdminMixin,
+                ImportExportModelAdmin):
     resource_classes = [UserResource]
     list_display = (
         'id',
@@ -35,14 +119,10 @@ class UserAdmin(ImportExportModelAdmin,):
         'last_name',
     )
     search_fields = (
-        'id',
-        'role',
-        'first_name',
-        'last_name',
-        'username',
-        'email',
+        'username__startswith',
+        'email__startswith',
     )
-    list_filter = ('username',)
+    list_filter = ('role',)
     empty_value_display = '-пусто-'
 
 
@@ -62,7 +142,6 @@ class CategoryAdmin(ImportExportModelAdmin):
         'slug',
     )
     search_fields = ('name',)
-    list_filter = ('name',)
     empty_value_display = '-пусто-'
 
 
@@ -82,7 +161,7 @@ class CommentResource(resources.ModelResource):
         )
 
 
-class CommentAdmin(ImportExportModelAdmin):
+class CommentAdmin(LargeTableAdminMixin, ImportExportModelAdmin):
     resource_classes = [CommentResource]
     list_display = (
         'id',
@@ -91,8 +170,11 @@ class CommentAdmin(ImportExportModelAdmin):
         'author',
         'pub_date',
     )
-    search_fields = ('review_id',)
-    list_filter = ('review_id',)
+    list_select_related = ('author',)
+    raw_id_fields = ('review',)
+    autocomplete_fields = ('author',)
+    id_search_fields = ('pk', 'review_id')
+    list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
 
 
@@ -112,7 +194,6 @@ class GenreAdmin(ImportExportModelAdmin):
         'slug',
     )
     search_fields = ('name',)
-    list_filter = ('name',)
     empty_value_display = '-пусто-'
 
 
@@ -132,7 +213,7 @@ class ReviewResource(resources.ModelResource):
         )
 
 
-class ReviewAdmin(ImportExportModelAdmin):
+class ReviewAdmin(LargeTableAdminMixin, ImportExportModelAdmin):
     resource_classes = [ReviewResource]
     list_display = (
         'id',
@@ -142,7 +223,9 @@ class ReviewAdmin(ImportExportModelAdmin):
         'score',
         'pub_date'
     )
-    search_fields = ('id', 'pub_date',)
+    list_select_related = ('title', 'author')
+    autocomplete_fields = ('title', 'author')
+    id_search_fields = ('pk', 'title_id')
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
 
@@ -160,7 +243,8 @@ class TitleResource(resources.ModelResource):
         )
 
 
-class TitleAdmin(ImportExportModelAdmin):
+class TitleAdmin(LargeTableAdminMixin, SoftDeleteAdminMixin,
+                 ImportExportModelAdmin):
     resource_classes = [TitleResource]
     list_display = (
         'id',
@@ -169,11 +253,17 @@ class TitleAdmin(ImportExportModelAdmin):
         'category',
         'description',
     )
+    list_select_related = ('category',)
     search_fields = ('name',)
-    list_filter = ('name',)
+    list_filter = ('category',)
     exclude = ('genres',)
     empty_value_display = '-пусто-'
 
+    def search_text(self, request, queryset, search_term):
+        # Тот же индекс, что и в API, но без ранга: список всё равно
+        # сортируется по ordering, а ранг считался бы для каждой строки.
+        return get_title_search(queryset.db).filter(queryset, search_term)
+
 
 class GenreTitleResource(resources.ModelResource):
 
@@ -186,15 +276,16 @@ class GenreTitleResource(resources.ModelResource):
         )
 
 
-class GenreTitleAdmin(ImportExportModelAdmin):
+class GenreTitleAdmin(LargeTableAdminMixin, ImportExportModelAdmin):
     resource_classes = [GenreTitleResource]
     list_display = (
         'id',
         'title_id',
         'genre_id',
     )
-    search_fields = ('id',)
-    list_filter = ('id',)
+    autocomplete_fields = ('title', 'genre')
+    id_search_fields = ('title_id',)
+    list_filter = ('genre',)
     empty_value_display = '-пусто-'
 
 
@@ -0,0 +1,34 @@
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Comment, Review
+
+
+def change_comments_count(review_id, delta):
+    """Атомарно сдвигает число комментариев отзыва."""
+    Review.objects.filter(pk=review_id).update(
+        comments_count=F('comments_count') + delta
+    )
+
+
+def rebuild_comments_counts(review_ids=None):
+    """Пересчитывает число комментариев отзывов без удалённых авторов."""
+    reviews = Review.objects.all()
+    if review_ids is not None:
+        reviews = reviews.filter(pk__in=review_ids)
+    reviews.update(comments_count=Coalesce(Subquery(
+        Comment.objects.filter(
+            review=OuterRef('pk'), author__is_deleted=False
+        ).order_by().values('review').annotate(
+            total=Count('id')
+        ).values('total')
+    ), 0))
+
+
+def find_comments_count_mismatches():
+    """Отзывы, чьё сохранённое число комментариев расходится с таблицей."""
+    return Review.objects.annotate(actual_comments_count=Count(
+        'comments', filter=Q(comments__author__is_deleted=False)
+    )).filter(
+        ~Q(comments_count=F('actual_comments_count'))
+    ).order_by('pk')
@@ -0,0 +1,313 @@
+import csv
+import datetime
+import io
+import random
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Max
+
+from .models import Category, Comment, Genre, GenreTitle, Review, Title, User
+
+WORDS = (
+    'звезда', 'поезд', 'город', 'ночь', 'море', 'война', 'любовь', 'дом',
+    'тень', 'огонь', 'время', 'путь', 'сад', 'небо', 'зима', 'остров',
+)
+CATEGORIES = 10
+GENRES = 30
+START_DATE = datetime.datetime(2015, 1, 1, tzinfo=datetime.timezone.utc)
+DATE_SPAN = 7 * 365 * 24 * 3600
+
+
+def allocate(total, weights, cap=None):
+    """Делит ``total`` пропорционально ``weights``, не больше ``cap`` на долю.
+
+    Остаток после округления вниз раздаётся по одному по порядку весов,
+    поэтому сумма долей всегда равна ``total``. Доля с нулевым весом
+    остаётся пустой.
+    """
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    if cap is not None:
+        counts = [min(count, cap) for count in counts]
+    left = total - sum(counts)
+    while left:
+        progress = False
+        for index, count in enumerate(counts):
+            if not weights[index] or (cap is not None and count >= cap):
+                continue
+            counts[index] += 1
+            left -= 1
+            progress = True
+            if not left:
+                break
+        if not progress:
+            raise ValueError(f'Нельзя разместить {total} при лимите {cap}.')
+    return counts
+
+
+class TableWriter:
+    """Пакетная вставка строк в таблицу модели без создания объектов.
+
+    На PostgreSQL пакет отправляется через ``COPY``, на остальных
+    СУБД — одним ``executemany``. Перед записью пакета сбрасываются
+    пакеты таблиц из ``depends_on``, чтобы внешние ключи уже
+    указывали на существующие строки.
+    """
+
+    def __init__(self, model, fields, using, batch_size, depends_on=()):
+        self.connection = connections[using]
+        self.batch_size = batch_size
+        self.depends_on = depends_on
+        self.fields = [model._meta.get_field(name) for name in fields]
+        self.table = model._meta.db_table
+        self.rows = []
+        self.written = 0
+        self.copy = self.connection.vendor == 'postgresql'
+        self.datetime_columns = [
+            index for index, field in enumerate(self.fields)
+            if field.get_internal_type() == 'DateTimeField'
+        ]
+
+    def add(self, *values):
+        self.rows.append(values)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        for writer in self.depends_on:
+            writer.flush()
+        with self.connection.cursor() as cursor:
+            if self.copy:
+                self.copy_rows(cursor)
+            else:
+                self.insert_rows(cursor)
+        self.written += len(self.rows)
+        self.rows = []
+
+    def copy_rows(self, cursor):
+        buffer = io.StringIO()
+        # Пустое значение без кавычек COPY читает как NULL.
+        csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC).writerows(self.rows)
+        buffer.seek(0)
+        columns = ', '.join(
+            self.connection.ops.quote_name(field.column)
+            for field in self.fields
+        )
+        cursor.cursor.copy_expert(
+            f'COPY {self.connection.ops.quote_name(self.table)} '
+            f'({columns}) FROM STDIN WITH (FORMAT csv)',
+            buffer,
+        )
+
+    def insert_rows(self, cursor):
+        ops = self.connection.ops
+        rows = self.rows
+        if self.datetime_columns:
+            rows = [list(row) for row in rows]
+            for row in rows:
+                for index in self.datetime_columns:
+                    row[index] = ops.adapt_datetimefield_value(row[index])
+        cursor.executemany(
+            'INSERT INTO {} ({}) VALUES ({})'.format(
+                ops.quote_name(self.table),
+                ', '.join(ops.quote_name(field.column)
+                          for field in self.fields),
+                ', '.join(['%s'] * len(self.fields)),
+            ),
+            rows,
+        )
+
+
+class DataGenerator:
+    """Детерминированный генератор больших объёмов данных.
+
+    Популярность произведений подчиняется закону Ципфа с показателем
+    ``skew``: несколько произведений собирают большую часть отзывов
+    и комментариев. Идентификаторы назначаются заранее, начиная
+    с текущего максимума, поэтому строки не перечитываются из базы,
+    а сумма оценок, рейтинг и число комментариев известны до вставки.
+    """
+
+    def __init__(self, titles, reviews, comments, users=None, skew=1.1,
+                 seed=0, batch_size=10000, using=DEFAULT_DB_ALIAS):
+        self.titles = titles
+        self.reviews = reviews
+        self.comments = comments
+        self.users = users or max(1000, reviews // 20)
+        self.skew = skew
+        self.batch_size = batch_size
+        self.using = using
+        self.rng = random.Random(seed)
+        if (reviews and not titles) or (comments and not reviews):
+            raise ValueError(
+                'Отзывам нужны произведения, а комментариям — отзывы.'
+            )
+        if reviews > self.users * titles:
+            raise ValueError(
+                'Пользователей слишком мало: каждый может оставить '
+                'только один отзыв на произведение.'
+            )
+
+    def writer(self, model, fields, depends_on=()):
+        return TableWriter(
+            model, fields, self.using, self.batch_size, depends_on
+        )
+
+    def next_id(self, model):
+        return (model._base_manager.using(self.using).aggregate(
+            top=Max('pk')
+        )['top'] or 0) + 1
+
+    def run(self):
+        """Создаёт данные одной транзакцией; возвращает число строк."""
+        self.written = {}
+        with transaction.atomic(using=self.using):
+            self.first_category = self.generate_catalog(
+                'categories', Category, CATEGORIES
+            )
+            self.first_genre = self.generate_catalog('genres', Genre, GENRES)
+            self.first_user = self.generate_users()
+            self.generate_titles()
+            self.reset_sequences()
+        return self.written
+
+    def reset_sequences(self):
+        connection = connections[self.using]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), (
+                Category, Genre, User, Title, GenreTitle, Review, Comment
+            )):
+                cursor.execute(sql)
+
+    def generate_catalog(self, name, model, count):
+        writer = self.writer(model, ('id', 'name', 'slug'))
+        first_id = self.next_id(model)
+        for number in range(first_id, first_id + count):
+            writer.add(
+                number, f'{model._meta.verbose_name} {number}', f'gen-{number}'
+            )
+        writer.flush()
+        self.written[name] = writer.written
+        return first_id
+
+    def generate_users(self):
+        writer = self.writer(User, (
+            'id', 'password', 'is_superuser', 'username', 'first_name',
+            'last_name', 'email', 'is_staff', 'is_active', 'date_joined',
+            'role', 'bio', 'is_deleted',
+        ))
+        first_id = self.next_id(User)
+        password = make_password(None)
+        for number in range(first_id, first_id + self.users):
+            writer.add(
+                number, password, False, f'gen{number}', '', '',
+                f'gen{number}@yamdb.fake', False, True, START_DATE,
+                User.USER, None, False,
+            )
+        writer.flush()
+        self.written['users'] = writer.written
+        return first_id
+
+    def distribute(self):
+        """Число отзывов и комментариев для каждого произведения."""
+        if not self.titles:
+            return [], []
+        ranks = list(range(self.titles))
+        self.rng.shuffle(ranks)
+        weights = [1 / (rank + 1) ** self.skew for rank in range(self.titles)]
+        by_rank = allocate(self.reviews, weights, cap=self.users)
+        reviews = [by_rank[rank] for rank in ranks]
+        if not self.comments:
+            return reviews, [0] * self.titles
+        return reviews, allocate(self.comments, reviews)
+
+    def generate_titles(self):
+        self.title_writer = self.writer(Title, (
+            'id', 'name', 'year', 'description', 'category', 'score_sum',
+            'reviews_count', 'rating', 'ranked_rating', 'is_deleted',
+        ))
+        self.genre_writer = self.writer(
+            GenreTitle, ('title', 'genre'), depends_on=(self.title_writer,)
+        )
+        self.review_writer = self.writer(Review, (
+            'id', 'title', 'author', 'score', 'comments_count', 'text',
+            'pub_date',
+        ), depends_on=(self.title_writer,))
+        self.comment_writer = self.writer(Comment, (
+            'id', 'review', 'author', 'text', 'pub_date',
+        ), depends_on=(self.review_writer,))
+        self.review_id = self.next_id(Review)
+        self.comment_id = self.next_id(Comment)
+        title_id = self.next_id(Title)
+        for reviews, comments in zip(*self.distribute()):
+            self.generate_title(title_id, reviews, comments)
+            title_id += 1
+        for name, writer in (
+            ('titles', self.title_writer),
+            ('genre_titles', self.genre_writer),
+            ('reviews', self.review_writer),
+            ('comments', self.comment_writer),
+        ):
+            writer.flush()
+            self.written[name] = writer.written
+
+    def generate_title(self, title_id, reviews, comments):
+        rng = self.rng
+        quality = rng.gauss(6.5, 1.5)
+        scores = [
+            min(10, max(1, round(rng.gauss(quality, 2))))
+            for _ in range(reviews)
+        ]
+        rating = sum(scores) / reviews if reviews else None
+        self.title_writer.add(
+            title_id,
+            ' '.join(rng.sample(WORDS, 2)).capitalize(),
+            rng.randint(1950, 2022),
+            None,
+            self.first_category + rng.randrange(CATEGORIES),
+            sum(scores),
+            reviews,
+            rating,
+            rating if reviews >= settings.LEADERBOARD_MIN_REVIEWS else None,
+            False,
+        )
+        for genre in rng.sample(range(GENRES), rng.randint(1, 3)):
+            self.genre_writer.add(title_id, self.first_genre + genre)
+
+        start = START_DATE + datetime.timedelta(
+            seconds=rng.randrange(DATE_SPAN // 2)
+        )
+        step = (DATE_SPAN // 2) // max(reviews, 1)
+        author_offset = rng.randrange(self.users)
+        # Обсуждают в основном первые, самые заметные отзывы.
+        discussed = [int(reviews * rng.random() ** 2) for _ in range(comments)]
+        comments_count = [0] * reviews
+        for number in discussed:
+            comments_count[number] += 1
+        for number, score in enumerate(scores):
+            self.review_writer.add(
+                self.review_id + number,
+                title_id,
+                self.first_user + (author_offset + number) % self.users,
+                score,
+                comments_count[number],
+                'Текст отзыва',
+                start + datetime.timedelta(seconds=number * step),
+            )
+        for number in discussed:
+            self.comment_writer.add(
+                self.comment_id,
+                self.review_id + number,
+                self.first_user + rng.randrange(self.users),
+                'Текст комментария',
+                start + datetime.timedelta(
+                    seconds=number * step + rng.randrange(step + 1)
+                ),
+            )
+            self.comment_id += 1
+        self.review_id += reviews
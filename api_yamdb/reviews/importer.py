@@ -0,0 +1,187 @@
+import csv
+import time
+from contextlib import contextmanager
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.color import no_style
+from django.db import connections, models, transaction
+
+from .models import (Category, Comment, Genre, GenreTitle, Review, Title, User,
+                     parse_csv_datetime)
+from .utils import chunked
+
+# Порядок важен: внешние ключи ссылаются на уже загруженные таблицы.
+IMPORT_FILES = (
+    ('users.csv', User),
+    ('category.csv', Category),
+    ('genre.csv', Genre),
+    ('titles.csv', Title),
+    ('genre_title.csv', GenreTitle),
+    ('review.csv', Review),
+    ('comments.csv', Comment),
+)
+IN_QUERY_CHUNK = 900
+
+
+@contextmanager
+def _keep_auto_now_add(model):
+    """Сохраняет даты из файла в полях с ``auto_now_add``."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class ImportStats:
+
+    def __init__(self, model):
+        self.model = model
+        self.created = 0
+        self.skipped = 0
+        self.started = time.monotonic()
+
+    @property
+    def seconds(self):
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self):
+        return self.created / self.seconds if self.seconds else 0
+
+    def __str__(self):
+        return (
+            f'{self.model._meta.verbose_name}: создано {self.created}, '
+            f'пропущено {self.skipped} за {self.seconds:.1f} с '
+            f'({self.rate:.0f} строк/с)'
+        )
+
+
+class CsvImporter:
+    """Потоковая загрузка CSV пачками через ``bulk_create``.
+
+    Файл читается по ``batch_size`` строк, поэтому память не зависит
+    от его размера. Внешние ключи каждой пачки проверяются одним
+    запросом на связанную таблицу, строки с несуществующими ссылками
+    пропускаются. С ``ignore_conflicts`` база не сообщает, сколько
+    строк вставлено, поэтому таблица считается до и после загрузки,
+    а конфликтующие строки попадают в пропущенные.
+    """
+
+    def __init__(self, model, batch_size=5000, ignore_conflicts=False,
+                 using='default'):
+        self.model = model
+        self.batch_size = batch_size
+        self.ignore_conflicts = ignore_conflicts
+        self.using = using
+
+    def _converter(self, field):
+        if isinstance(field, models.DateTimeField):
+            return parse_csv_datetime
+        if isinstance(field, (models.IntegerField, models.AutoField,
+                              models.ForeignKey)):
+            return int
+        return str
+
+    def _columns(self, header):
+        columns = []
+        for name in header:
+            try:
+                field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                field = next(
+                    (field for field in self.model._meta.concrete_fields
+                     if field.attname == name),
+                    None
+                )
+            if field is None or not field.concrete:
+                raise ValueError(
+                    f'{self.model.__name__}: неизвестная колонка {name}'
+                )
+            columns.append((
+                field.attname,
+                self._converter(field),
+                field.null,
+                field.remote_field.model if field.is_relation else None,
+            ))
+        return columns
+
+    def _existing_ids(self, related_model, ids):
+        existing = set()
+        for chunk in chunked(ids, IN_QUERY_CHUNK):
+            existing.update(
+                related_model._base_manager.using(self.using).filter(
+                    pk__in=chunk
+                ).values_list('pk', flat=True)
+            )
+        return existing
+
+    def _build(self, columns, rows, stats):
+        values = []
+        for row in rows:
+            item = {}
+            for (attname, convert, null, _), raw in zip(columns, row):
+                if raw == '':
+                    item[attname] = None if null else ''
+                else:
+                    item[attname] = convert(raw)
+            values.append(item)
+        for attname, _, _, related_model in columns:
+            if related_model is None:
+                continue
+            existing = self._existing_ids(
+                related_model,
+                {item[attname] for item in values
+                 if item[attname] is not None}
+            )
+            kept = [
+                item for item in values
+                if item[attname] is None or item[attname] in existing
+            ]
+            stats.skipped += len(values) - len(kept)
+            values = kept
+        return [self.model(**item) for item in values]
+
+    def count_rows(self):
+        return self.model._base_manager.using(self.using).count()
+
+    def run(self, stream):
+        stats = ImportStats(self.model)
+        reader = csv.reader(stream)
+        columns = self._columns(next(reader))
+        if self.ignore_conflicts:
+            rows_before = self.count_rows()
+        with _keep_auto_now_add(self.model):
+            for rows in chunked(reader, self.batch_size):
+                objects = self._build(columns, rows, stats)
+                with transaction.atomic(using=self.using):
+                    self.model._base_manager.using(
+                        self.using
+                    ).bulk_create(
+                        objects,
+                        batch_size=self.batch_size,
+                        ignore_conflicts=self.ignore_conflicts,
+                    )
+                stats.created += len(objects)
+        if self.ignore_conflicts:
+            inserted = self.count_rows() - rows_before
+            stats.skipped += stats.created - inserted
+            stats.created = inserted
+        self.reset_sequence()
+        return stats
+
+    def reset_sequence(self):
+        connection = connections[self.using]
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), [self.model]
+        )
+        if statements:
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from reviews.generator import DataGenerator
+from reviews.models import Category, Genre, Title, User
+from reviews.signals import catalog_imported
+
+
+class Command(BaseCommand):
+    help = (
+        'Быстро создаёт синтетические произведения, отзывы и комментарии '
+        'с неравномерной популярностью для нагрузочного тестирования.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=10000)
+        parser.add_argument('--reviews', type=int, default=500000)
+        parser.add_argument('--comments', type=int, default=1000000)
+        parser.add_argument(
+            '--users',
+            type=int,
+            help='Число авторов; по умолчанию max(1000, reviews / 20).'
+        )
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.1,
+            help='Показатель закона Ципфа для популярности произведений.'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Одинаковое зерно на пустой базе даёт одинаковые данные.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Сколько строк вставлять за раз.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            generator = DataGenerator(
+                options['titles'],
+                options['reviews'],
+                options['comments'],
+                users=options['users'],
+                skew=options['skew'],
+                seed=options['seed'],
+                batch_size=options['batch_size'],
+            )
+        except ValueError as error:
+            raise CommandError(str(error))
+        start = time.monotonic()
+        written = generator.run()
+        for name, count in written.items():
+            self.stdout.write(f'{name}: {count}')
+        catalog_imported.send(
+            sender=self.__class__, models=[Category, Genre, Title, User]
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Данные созданы за {time.monotonic() - start:.1f} с.'
+        ))
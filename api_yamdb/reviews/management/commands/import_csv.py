@@ -0,0 +1,72 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+from reviews.counters import rebuild_comments_counts
+from reviews.importer import IMPORT_FILES, CsvImporter
+from reviews.ratings import rebuild_ratings
+from reviews.signals import catalog_imported
+
+
+class Command(BaseCommand):
+    help = 'Загружает CSV-файлы каталога, отзывов и комментариев.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'directory',
+            help='Каталог с файлами: '
+                 + ', '.join(name for name, _ in IMPORT_FILES)
+        )
+        parser.add_argument(
+            '--only',
+            nargs='+',
+            metavar='FILE',
+            help='Загрузить только перечисленные файлы.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Сколько строк читать и вставлять за раз.'
+        )
+        parser.add_argument(
+            '--ignore-conflicts',
+            action='store_true',
+            help='Пропускать строки, которые уже есть в базе.'
+        )
+
+    def handle(self, *args, **options):
+        files = [
+            (name, model) for name, model in IMPORT_FILES
+            if not options['only'] or name in options['only']
+        ]
+        if not files:
+            raise CommandError('Нет подходящих файлов для загрузки.')
+        # Пачки коммитятся по одной, поэтому счётчики и рейтинги
+        # пересчитываются и после ошибки: загруженное уже в базе.
+        imported = []
+        try:
+            for name, model in files:
+                path = os.path.join(options['directory'], name)
+                if not os.path.exists(path):
+                    self.stdout.write(f'{name}: файл не найден, пропущен.')
+                    continue
+                importer = CsvImporter(
+                    model,
+                    batch_size=options['batch_size'],
+                    ignore_conflicts=options['ignore_conflicts'],
+                )
+                imported.append(model)
+                with open(path, encoding='utf-8', newline='') as stream:
+                    try:
+                        stats = importer.run(stream)
+                    except (ValueError, IntegrityError) as error:
+                        raise CommandError(f'{name}: {error}')
+                self.stdout.write(str(stats))
+        finally:
+            if imported:
+                rebuild_ratings()
+                rebuild_comments_counts()
+                catalog_imported.send(sender=self.__class__, models=imported)
+        if imported:
+            self.stdout.write(self.style.SUCCESS('Загрузка завершена.'))
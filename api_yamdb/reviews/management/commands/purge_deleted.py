@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+from reviews.purge import purge_deleted
+
+
+class Command(BaseCommand):
+    help = (
+        'Окончательно удаляет помеченные произведения и пользователей '
+        'вместе с отзывами и комментариями.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Сколько строк удалять одной транзакцией.'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а ждать новые удаления.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=60,
+            help='Пауза в секундах, когда удалять нечего.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            objects, rows = purge_deleted(options['batch_size'])
+            if objects:
+                self.stdout.write(
+                    f'Удалено объектов: {objects}, строк под ними: {rows}.'
+                )
+                continue
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from reviews.ratings import find_rating_mismatches, rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает и проверяет сохранённые рейтинги произведений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить рейтинги, ничего не изменяя.'
+        )
+
+    def handle(self, *args, **options):
+        if not options['check']:
+            with transaction.atomic():
+                rebuild_ratings()
+            self.stdout.write('Рейтинги пересчитаны.')
+        mismatches = list(
+            find_rating_mismatches().values_list('pk', flat=True)[:20]
+        )
+        if mismatches:
+            raise CommandError(
+                'Рейтинг расходится с отзывами у произведений: '
+                + ', '.join(map(str, mismatches))
+            )
+        self.stdout.write(self.style.SUCCESS('Рейтинги согласованы.'))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from reviews.counters import (find_comments_count_mismatches,
+                              rebuild_comments_counts)
+from reviews.ratings import find_rating_mismatches, rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает и проверяет число отзывов произведений '
+        'и число комментариев отзывов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить счётчики, ничего не изменяя.'
+        )
+
+    def handle(self, *args, **options):
+        if not options['check']:
+            with transaction.atomic():
+                rebuild_ratings()
+                rebuild_comments_counts()
+            self.stdout.write('Счётчики пересчитаны.')
+        errors = []
+        for message, mismatches in (
+            ('Число отзывов расходится у произведений',
+             find_rating_mismatches()),
+            ('Число комментариев расходится у отзывов',
+             find_comments_count_mismatches()),
+        ):
+            pks = list(mismatches.values_list('pk', flat=True)[:20])
+            if pks:
+                errors.append(f'{message}: {", ".join(map(str, pks))}')
+        if errors:
+            raise CommandError('\n'.join(errors))
+        self.stdout.write(self.style.SUCCESS('Счётчики согласованы.'))
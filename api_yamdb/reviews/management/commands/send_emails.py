@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+from reviews.outbox import send_pending
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Сколько писем отправлять через одно соединение.'
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            help='После скольких неудачных попыток письмо пропускается.'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а ждать новые письма.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза в секундах, когда очередь пуста.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = send_pending(
+                options['batch_size'], options['max_attempts']
+            )
+            if sent or failed:
+                self.stdout.write(
+                    f'Отправлено: {sent}, с ошибкой: {failed}.'
+                )
+                continue
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
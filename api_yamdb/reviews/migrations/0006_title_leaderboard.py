@@ -0,0 +1,50 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:34
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import (Case, ExpressionWrapper, F, FloatField, Value,
+                              When)
+from django.db.models.functions import Cast
+
+
+def fill_ranked_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Title.objects.update(ranked_rating=Case(
+        When(
+            reviews_count__lt=settings.LEADERBOARD_MIN_REVIEWS,
+            then=Value(None)
+        ),
+        default=ExpressionWrapper(
+            Cast('score_sum', FloatField()) / F('reviews_count'),
+            output_field=FloatField()
+        ),
+        output_field=FloatField()
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_outbox_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='ranked_rating',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_ranked_ratings, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['ranked_rating', 'id'], name='reviews_tit_ranked__646e09_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'ranked_rating', 'id'], name='reviews_tit_categor_b4e767_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year', 'ranked_rating', 'id'], name='reviews_tit_year_7849bc_idx'),
+        ),
+    ]
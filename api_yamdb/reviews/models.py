@@ -1,15 +1,63 @@
 import datetime
 
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.utils import timezone
 
 from .validators import username_validate, validate_year
 
 CSV_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
 
 
-class User(AbstractUser):
+def parse_csv_datetime(value):
+    """Разбирает дату из CSV в разы быстрее, чем ``strptime``."""
+    try:
+        parsed = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        parsed = datetime.datetime.strptime(value, CSV_DATETIME_FORMAT)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+class NotDeletedManagerMixin:
+    """Скрывает строки, помеченные на удаление."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
+
+
+class NotDeletedManager(NotDeletedManagerMixin, models.Manager):
+    pass
+
+
+class NotDeletedUserManager(NotDeletedManagerMixin, UserManager):
+    pass
+
+
+class SoftDeleteModel(models.Model):
+    """Удаление пометкой: строка сразу пропадает из ``objects``.
+
+    Связанные отзывы и комментарии потом удаляет пачками команда
+    ``purge_deleted``; до этого объект виден только через
+    ``all_objects``. Отзывы и комментарии удалённого пользователя
+    скрываются из API и счётчиков сразу.
+    """
+    is_deleted = models.BooleanField(
+        default=False,
+        editable=False
+    )
+
+    class Meta:
+        abstract = True
+
+    def soft_delete(self):
+        self.is_deleted = True
+        self.save(update_fields=('is_deleted',))
+
+
+class User(SoftDeleteModel, AbstractUser):
     ADMIN = 'admin'
     MODERATOR = 'moderator'
     USER = 'user'
@@ -37,6 +85,9 @@ class User(AbstractUser):
         blank=True
     )
 
+    objects = NotDeletedUserManager()
+    all_objects = UserManager()
+
     @property
     def is_admin(self):
         return (
@@ -94,7 +145,7 @@ class Genre(CategoryGenre):
         return self.name
 
 
-class Title(models.Model):
+class Title(SoftDeleteModel):
     """Конкретный объект."""
     name = models.CharField(
         max_length=200
@@ -117,10 +168,36 @@ class Title(models.Model):
         related_name='titles',
         null=True
     )
+    score_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False
+    )
+    reviews_count = models.PositiveIntegerField(
+        default=0,
+        editable=False
+    )
+    rating = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False
+    )
+    ranked_rating = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False
+    )
+
+    objects = NotDeletedManager()
+    all_objects = models.Manager()
 
     class Meta:
         verbose_name = 'Произведение'
         ordering = ('name',)
+        indexes = (
+            models.Index(fields=('ranked_rating', 'id')),
+            models.Index(fields=('category', 'ranked_rating', 'id')),
+            models.Index(fields=('year', 'ranked_rating', 'id')),
+        )
 
     def __str__(self):
         return self.name
@@ -178,9 +255,24 @@ class Review(DatePubText):
             )
         )
     )
+    comments_count = models.PositiveIntegerField(
+        default=0,
+        editable=False
+    )
 
     class Meta:
         unique_together = ('author', 'title')
+        indexes = (
+            models.Index(fields=('title', 'pub_date', 'id')),
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Отложенные через only() поля не догружаются ради сигналов.
+        if 'title_id' in field_names and 'score' in field_names:
+            instance._rating_state = (instance.title_id, instance.score)
+        return instance
 
     @property
     def csv_pub_date(self):
@@ -189,8 +281,7 @@ class Review(DatePubText):
     @csv_pub_date.setter
     def csv_pub_date(self, value):
         if value:
-            self.pub_date = datetime.datetime.strptime(
-                value, CSV_DATETIME_FORMAT)
+            self.pub_date = parse_csv_datetime(value)
 
 
 class Comment(DatePubText):
@@ -209,6 +300,16 @@ class Comment(DatePubText):
     class Meta:
         verbose_name = 'Комментарий'
         ordering = ('pub_date',)
+        indexes = (
+            models.Index(fields=('review', 'pub_date', 'id')),
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'review_id' in field_names:
+            instance._counter_state = instance.review_id
+        return instance
 
     @property
     def csv_pub_date(self):
@@ -217,5 +318,46 @@ class Comment(DatePubText):
     @csv_pub_date.setter
     def csv_pub_date(self, value):
         if value:
-            self.pub_date = datetime.datetime.strptime(value,
-                                                       CSV_DATETIME_FORMAT)
+            self.pub_date = parse_csv_datetime(value)
+
+
+class OutboxEmail(models.Model):
+    """Письмо в очереди на отправку."""
+    subject = models.CharField(
+        max_length=255
+    )
+    body = models.TextField()
+    from_email = models.CharField(
+        max_length=254
+    )
+    recipients = models.TextField()
+    created = models.DateTimeField(
+        auto_now_add=True
+    )
+    send_after = models.DateTimeField(
+        default=timezone.now
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True
+    )
+    last_error = models.TextField(
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = 'Письмо'
+        ordering = ('send_after', 'id')
+        indexes = (
+            models.Index(fields=('sent_at', 'send_after')),
+        )
+
+    def __str__(self):
+        return f'{self.subject} -> {self.recipients}'
+
+    @property
+    def recipient_list(self):
+        return self.recipients.split(',')
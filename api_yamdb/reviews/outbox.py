@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+
+def enqueue_email(subject, message, from_email, recipient_list):
+    """Ставит письмо в очередь вместо отправки во время запроса."""
+    return OutboxEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email,
+        recipients=','.join(recipient_list),
+    )
+
+
+def retry_delay(attempts):
+    """Экспоненциальная задержка перед следующей попыткой."""
+    return timedelta(
+        seconds=settings.OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def _mark_failed(email, error, now):
+    email.attempts += 1
+    email.last_error = repr(error)
+    email.send_after = now + retry_delay(email.attempts)
+
+
+def send_pending(batch_size=None, max_attempts=None):
+    """Отправляет пачку писем через одно почтовое соединение.
+
+    Возвращает число отправленных и неотправленных писем. Строки
+    пачки заблокированы до конца отправки, поэтому несколько
+    обработчиков могут разбирать очередь одновременно.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    max_attempts = max_attempts or settings.OUTBOX_MAX_ATTEMPTS
+    sent = failed = 0
+    with transaction.atomic():
+        now = timezone.now()
+        batch = list(OutboxEmail.objects.select_for_update(
+            skip_locked=True
+        ).filter(
+            sent_at__isnull=True,
+            send_after__lte=now,
+            attempts__lt=max_attempts,
+        )[:batch_size])
+        if not batch:
+            return sent, failed
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as error:
+            for email in batch:
+                _mark_failed(email, error, now)
+            failed = len(batch)
+        else:
+            try:
+                for email in batch:
+                    try:
+                        EmailMessage(
+                            email.subject,
+                            email.body,
+                            email.from_email,
+                            email.recipient_list,
+                            connection=connection,
+                        ).send()
+                    except Exception as error:
+                        _mark_failed(email, error, now)
+                        failed += 1
+                    else:
+                        email.attempts += 1
+                        email.sent_at = timezone.now()
+                        email.last_error = ''
+                        sent += 1
+            finally:
+                connection.close()
+        OutboxEmail.objects.bulk_update(
+            batch, ('attempts', 'sent_at', 'send_after', 'last_error')
+        )
+    return sent, failed
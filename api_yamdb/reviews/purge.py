@@ -0,0 +1,114 @@
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from .counters import change_comments_count
+from .models import Comment, Review, Title, User
+from .ratings import change_rating
+from .signals import reviews_purged
+
+
+def purge_comments(queryset, batch_size, using=DEFAULT_DB_ALIAS):
+    """Удаляет комментарии пачками по ``batch_size``.
+
+    Строки удаляются без сборщика каскадов и сигналов, а счётчики
+    отзывов сдвигаются одним ``UPDATE`` на отзыв в той же транзакции.
+    Комментарии удалённых авторов из счётчиков уже вычтены.
+    """
+    deleted = 0
+    while True:
+        with transaction.atomic(using=using):
+            rows = list(queryset.using(using).order_by('pk').values_list(
+                'pk', 'review_id', 'author__is_deleted'
+            )[:batch_size])
+            if not rows:
+                return deleted
+            Comment.objects.using(using).filter(
+                pk__in=[pk for pk, *_ in rows]
+            )._raw_delete(using)
+            for review_id, count in Counter(
+                review_id for _, review_id, hidden in rows if not hidden
+            ).items():
+                change_comments_count(review_id, -count)
+        deleted += len(rows)
+
+
+def purge_reviews(queryset, batch_size, using=DEFAULT_DB_ALIAS):
+    """Удаляет отзывы пачками по ``batch_size``.
+
+    Комментарии к ним лучше удалить заранее через ``purge_comments``,
+    здесь удаляются только появившиеся позже. Сумма оценок и число
+    отзывов произведения сдвигаются один раз на пачку, поэтому рейтинг
+    согласован с оставшимися отзывами после каждой транзакции. Отзывы
+    удалённых авторов из рейтинга уже вычтены.
+    """
+    deleted = 0
+    while True:
+        with transaction.atomic(using=using):
+            rows = list(queryset.using(using).order_by('pk').values_list(
+                'pk', 'title_id', 'score', 'author__is_deleted'
+            )[:batch_size])
+            if not rows:
+                return deleted
+            review_ids = [pk for pk, *_ in rows]
+            purge_comments(
+                Comment.objects.filter(review_id__in=review_ids),
+                batch_size, using
+            )
+            Review.objects.using(using).filter(
+                pk__in=review_ids
+            )._raw_delete(using)
+            changes = defaultdict(lambda: [0, 0])
+            for _, title_id, score, hidden in rows:
+                if hidden:
+                    continue
+                changes[title_id][0] -= score
+                changes[title_id][1] -= 1
+            for title_id, (score_delta, count_delta) in changes.items():
+                change_rating(title_id, score_delta, count_delta)
+            reviews_purged.send(
+                sender=Review, title_ids=list(changes), using=using
+            )
+        deleted += len(rows)
+
+
+def purge_title(title, batch_size, using=DEFAULT_DB_ALIAS):
+    reviews = Review.objects.filter(title=title)
+    deleted = purge_comments(
+        Comment.objects.filter(review__in=reviews), batch_size, using
+    )
+    deleted += purge_reviews(reviews, batch_size, using)
+    Title.all_objects.using(using).filter(pk=title.pk).delete()
+    return deleted
+
+
+def purge_user(user, batch_size, using=DEFAULT_DB_ALIAS):
+    reviews = Review.objects.filter(author=user)
+    deleted = purge_comments(
+        Comment.objects.filter(author=user), batch_size, using
+    )
+    deleted += purge_comments(
+        Comment.objects.filter(review__in=reviews), batch_size, using
+    )
+    deleted += purge_reviews(reviews, batch_size, using)
+    User.all_objects.using(using).filter(pk=user.pk).delete()
+    return deleted
+
+
+def purge_deleted(batch_size=None, using=DEFAULT_DB_ALIAS):
+    """Окончательно удаляет помеченные произведения и пользователей.
+
+    Отзывы и комментарии удаляются короткими транзакциями, так что
+    ни одна из них не держит блокировки и память дольше одной пачки.
+    Возвращает число удалённых объектов и строк под ними.
+    """
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    purged = objects = 0
+    for model, purge in ((Title, purge_title), (User, purge_user)):
+        for instance in model.all_objects.using(using).filter(
+            is_deleted=True
+        ).only('pk').iterator():
+            purged += purge(instance, batch_size, using)
+            objects += 1
+    return objects, purged
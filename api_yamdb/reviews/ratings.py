@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.db.models import (Case, Count, ExpressionWrapper, F, FloatField,
+                              OuterRef, Q, Subquery, Sum, Value, When)
+from django.db.models.functions import Cast, Coalesce
+
+from .models import Review, Title
+
+
+def rating_expression(score_delta=0, count_delta=0, min_reviews=1):
+    """Средняя оценка, вычисленная из суммы оценок и числа отзывов.
+
+    Пустая, если отзывов после сдвига меньше ``min_reviews``.
+    """
+    return Case(
+        When(
+            reviews_count__lt=min_reviews - count_delta,
+            then=Value(None)
+        ),
+        default=ExpressionWrapper(
+            Cast(F('score_sum') + score_delta, FloatField())
+            / (F('reviews_count') + count_delta),
+            output_field=FloatField()
+        ),
+        output_field=FloatField()
+    )
+
+
+def change_rating(title_id, score_delta, count_delta):
+    """Атомарно сдвигает сумму оценок и число отзывов произведения."""
+    Title.all_objects.filter(pk=title_id).update(
+        score_sum=F('score_sum') + score_delta,
+        reviews_count=F('reviews_count') + count_delta,
+        rating=rating_expression(score_delta, count_delta),
+        ranked_rating=rating_expression(
+            score_delta, count_delta, settings.LEADERBOARD_MIN_REVIEWS
+        )
+    )
+
+
+def rebuild_ratings(title_ids=None):
+    """Пересчитывает рейтинг произведений без отзывов удалённых авторов."""
+    titles = Title.all_objects.all()
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+    reviews = Review.objects.filter(
+        title=OuterRef('pk'), author__is_deleted=False
+    ).order_by().values('title')
+    titles.update(
+        score_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0
+        ),
+        reviews_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('id')).values('total')),
+            0
+        ),
+    )
+    titles.update(
+        rating=rating_expression(),
+        ranked_rating=rating_expression(
+            min_reviews=settings.LEADERBOARD_MIN_REVIEWS
+        )
+    )
+
+
+def find_rating_mismatches():
+    """Произведения, чей сохранённый рейтинг расходится с отзывами."""
+    counted = Q(reviews__author__is_deleted=False)
+    return Title.all_objects.annotate(
+        actual_score_sum=Coalesce(Sum('reviews__score', filter=counted), 0),
+        actual_reviews_count=Count('reviews', filter=counted),
+    ).filter(
+        ~Q(score_sum=F('actual_score_sum'))
+        | ~Q(reviews_count=F('actual_reviews_count'))
+    ).order_by('pk')
+
+
+def top_titles(queryset, limit):
+    """Лучшие произведения по индексу сохранённого рейтинга.
+
+    В рейтинг попадают только произведения, у которых не меньше
+    ``LEADERBOARD_MIN_REVIEWS`` отзывов, поэтому выборка первых
+    ``limit`` строк читает ровно ``limit`` записей индекса.
+    """
+    return queryset.filter(
+        ranked_rating__isnull=False
+    ).order_by('-ranked_rating', '-id')[:limit]
@@ -0,0 +1,230 @@
+from django.db import DatabaseError, OperationalError, connections, transaction
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'reviews_title_fts'
+FTS_TRIGGERS = {
+    'reviews_title_fts_insert': (
+        'AFTER INSERT ON reviews_title BEGIN '
+        'INSERT INTO {fts}(rowid, name, description) '
+        'VALUES (new.id, new.name, new.description); END'
+    ),
+    'reviews_title_fts_delete': (
+        'AFTER DELETE ON reviews_title BEGIN '
+        "INSERT INTO {fts}({fts}, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); END"
+    ),
+    'reviews_title_fts_update': (
+        'AFTER UPDATE OF name, description ON reviews_title BEGIN '
+        "INSERT INTO {fts}({fts}, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); "
+        'INSERT INTO {fts}(rowid, name, description) '
+        'VALUES (new.id, new.name, new.description); END'
+    ),
+}
+PG_DOCUMENT_TEMPLATE = (
+    "to_tsvector('simple', COALESCE({table}\"name\", '') || ' ' "
+    "|| COALESCE({table}\"description\", ''))"
+)
+PG_DOCUMENT = PG_DOCUMENT_TEMPLATE.format(table='"reviews_title".')
+PG_TRGM = 'pg_trgm'
+PG_INDEXES = {
+    'reviews_title_search_idx': 'USING GIN (({}))'.format(
+        PG_DOCUMENT_TEMPLATE.format(table='')
+    ),
+}
+PG_TRGM_INDEXES = {
+    'reviews_title_name_trgm_idx': 'USING GIN ("name" gin_trgm_ops)',
+    'reviews_title_name_upper_trgm_idx': (
+        'USING GIN ((UPPER("name"::text)) gin_trgm_ops)'
+    ),
+}
+
+_backends = {}
+
+
+class TitleSearch:
+    """Поиск без индекса: подстрока в названии.
+
+    ``filter`` только отбирает найденное, ``search`` ещё и сортирует
+    по релевантности.
+    """
+
+    def filter(self, queryset, query):
+        return queryset.filter(name__icontains=query)
+
+    def search(self, queryset, query):
+        return self.filter(queryset, query)
+
+
+class PostgresTitleSearch(TitleSearch):
+    """Полнотекстовый поиск и триграммы по GIN-индексам.
+
+    Без расширения ``pg_trgm`` остаётся только полнотекстовый поиск.
+    """
+
+    def __init__(self, trigram=True):
+        self.trigram = trigram
+
+    def filter(self, queryset, query):
+        if not self.trigram:
+            return queryset.extra(
+                where=[f"{PG_DOCUMENT} @@ plainto_tsquery('simple', %s)"],
+                params=[query],
+            )
+        return queryset.extra(
+            where=[
+                f"({PG_DOCUMENT} @@ plainto_tsquery('simple', %s) "
+                'OR "reviews_title"."name" %% %s)'
+            ],
+            params=[query, query],
+        )
+
+    def search(self, queryset, query):
+        rank = f"ts_rank({PG_DOCUMENT}, plainto_tsquery('simple', %s))"
+        params = [query]
+        if self.trigram:
+            rank += ' + similarity("reviews_title"."name", %s)'
+            params.append(query)
+        return self.filter(queryset, query).annotate(
+            search_rank=RawSQL(rank, params)
+        ).order_by('-search_rank', 'name')
+
+
+class SQLiteTitleSearch(TitleSearch):
+    """Поиск по FTS5-таблице, которую синхронизируют триггеры."""
+
+    @staticmethod
+    def match_expression(query):
+        terms = [
+            '"{}"*'.format(term.replace('"', '""'))
+            for term in query.split()
+        ]
+        return ' '.join(terms)
+
+    def filter(self, queryset, query):
+        match = self.match_expression(query)
+        if not match:
+            return queryset.none()
+        return queryset.extra(
+            where=[
+                f'"reviews_title"."id" IN (SELECT rowid FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s)'
+            ],
+            params=[match],
+        )
+
+    def search(self, queryset, query):
+        match = self.match_expression(query)
+        if not match:
+            return queryset.none()
+        return self.filter(queryset, query).annotate(search_rank=RawSQL(
+            f'(SELECT -rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+            'AND rowid = "reviews_title"."id")',
+            (match,)
+        )).order_by('-search_rank', 'name')
+
+
+def get_title_search(using='default'):
+    """Подбирает поиск под базу данных соединения ``using``."""
+    if using not in _backends:
+        connection = connections[using]
+        backend = TitleSearch()
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                backend = PostgresTitleSearch(_has_pg_trgm(cursor))
+        elif (
+            connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names()
+        ):
+            backend = SQLiteTitleSearch()
+        _backends[using] = backend
+    return _backends[using]
+
+
+def _install_fts_triggers(cursor):
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+        'AND tbl_name = %s', ['reviews_title']
+    )
+    existing = {row[0] for row in cursor.fetchall()}
+    if existing.issuperset(FTS_TRIGGERS):
+        return
+    for name, definition in FTS_TRIGGERS.items():
+        cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        cursor.execute(
+            f'CREATE TRIGGER {name} ' + definition.format(fts=FTS_TABLE)
+        )
+    cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def _has_pg_trgm(cursor):
+    cursor.execute('SELECT 1 FROM pg_extension WHERE extname = %s', [PG_TRGM])
+    return cursor.fetchone() is not None
+
+
+def _install_pg_trgm(connection, cursor):
+    """Включает ``pg_trgm``; ``False``, если прав на это нет."""
+    if _has_pg_trgm(cursor):
+        return True
+    try:
+        # Ошибка вне точки сохранения прервала бы всю миграцию.
+        with transaction.atomic(using=connection.alias):
+            cursor.execute(f'CREATE EXTENSION IF NOT EXISTS {PG_TRGM}')
+    except DatabaseError:
+        return False
+    return True
+
+
+def install_search_index(connection):
+    """Создаёт поисковые индексы, если база их поддерживает.
+
+    Триграммные индексы в PostgreSQL создаются, только если удалось
+    включить ``pg_trgm``; иначе остаётся полнотекстовый индекс.
+    """
+    _backends.pop(connection.alias, None)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            indexes = dict(PG_INDEXES)
+            if _install_pg_trgm(connection, cursor):
+                indexes.update(PG_TRGM_INDEXES)
+            for name, definition in indexes.items():
+                cursor.execute(
+                    f'CREATE INDEX IF NOT EXISTS {name} '
+                    f'ON reviews_title {definition}'
+                )
+        elif connection.vendor == 'sqlite':
+            try:
+                cursor.execute(
+                    f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} '
+                    'USING fts5(name, description, '
+                    "content='reviews_title', content_rowid='id')"
+                )
+            except OperationalError:
+                return
+            _install_fts_triggers(cursor)
+
+
+def repair_search_index(connection):
+    """Возвращает триггеры FTS5, потерянные при пересоздании таблицы.
+
+    SQLite выполняет изменения схемы через копирование таблицы,
+    и вместе со старой таблицей удаляются её триггеры.
+    """
+    if (
+        connection.vendor == 'sqlite'
+        and FTS_TABLE in connection.introspection.table_names()
+    ):
+        with connection.cursor() as cursor:
+            _install_fts_triggers(cursor)
+
+
+def uninstall_search_index(connection):
+    _backends.pop(connection.alias, None)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            for name in (*PG_INDEXES, *PG_TRGM_INDEXES):
+                cursor.execute(f'DROP INDEX IF EXISTS {name}')
+        elif connection.vendor == 'sqlite':
+            for name in FTS_TRIGGERS:
+                cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+            cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
@@ -0,0 +1,113 @@
+from django.db import connections
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import Signal, receiver
+
+from .counters import change_comments_count, rebuild_comments_counts
+from .models import Comment, Review, User
+from .ratings import change_rating, rebuild_ratings
+from .search import repair_search_index
+
+# Массовая загрузка данных мимо сигналов моделей.
+catalog_imported = Signal()
+# Пачка отзывов удалена или скрыта мимо сигналов моделей.
+reviews_purged = Signal()
+
+
+def author_is_deleted(instance):
+    """Удалён ли автор отзыва или комментария.
+
+    Загруженный автор проверяется без запроса, иначе проверка идёт
+    по ``author_id`` и первичному ключу, без загрузки пользователя.
+    """
+    field = instance._meta.get_field('author')
+    if field.is_cached(instance):
+        author = field.get_cached_value(instance)
+        if 'is_deleted' not in author.get_deferred_fields():
+            return author.is_deleted
+    return User.all_objects.filter(
+        pk=instance.author_id, is_deleted=True
+    ).exists()
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    if author_is_deleted(instance):
+        return
+    previous = getattr(instance, '_rating_state', None)
+    if created:
+        change_rating(instance.title_id, instance.score, 1)
+    elif previous is None:
+        rebuild_ratings([instance.title_id])
+    else:
+        previous_title_id, previous_score = previous
+        if previous_title_id != instance.title_id:
+            change_rating(previous_title_id, -previous_score, -1)
+            change_rating(instance.title_id, instance.score, 1)
+        elif previous_score != instance.score:
+            change_rating(
+                instance.title_id, instance.score - previous_score, 0
+            )
+    instance._rating_state = (instance.title_id, instance.score)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    if author_is_deleted(instance):
+        return
+    title_id, score = getattr(
+        instance, '_rating_state', (instance.title_id, instance.score)
+    )
+    change_rating(title_id, -score, -1)
+
+
+@receiver(post_save, sender=Comment)
+def update_comments_count_on_save(sender, instance, created, **kwargs):
+    if author_is_deleted(instance):
+        return
+    previous = getattr(instance, '_counter_state', None)
+    if created:
+        change_comments_count(instance.review_id, 1)
+    elif previous is None:
+        rebuild_comments_counts([instance.review_id])
+    elif previous != instance.review_id:
+        change_comments_count(previous, -1)
+        change_comments_count(instance.review_id, 1)
+    instance._counter_state = instance.review_id
+
+
+@receiver(post_delete, sender=Comment)
+def update_comments_count_on_delete(sender, instance, **kwargs):
+    if author_is_deleted(instance):
+        return
+    change_comments_count(
+        getattr(instance, '_counter_state', instance.review_id), -1
+    )
+
+
+@receiver(post_save, sender=User)
+def withdraw_deleted_author(sender, instance, update_fields, **kwargs):
+    """Убирает из счётчиков отзывы и комментарии удалённого автора.
+
+    Затронутые счётчики пересчитываются целиком, поэтому повторный
+    вызов ничего не сдвигает. Дальше сигналы отзывов и комментариев
+    этого автора счётчики не трогают.
+    """
+    if not instance.is_deleted or 'is_deleted' not in (update_fields or ()):
+        return
+    title_ids = list(Review.objects.filter(
+        author=instance
+    ).order_by().values_list('title_id', flat=True).distinct())
+    if title_ids:
+        rebuild_ratings(title_ids)
+        reviews_purged.send(
+            sender=Review, title_ids=title_ids, using=kwargs['using']
+        )
+    rebuild_comments_counts(Comment.objects.filter(
+        author=instance
+    ).values('review_id'))
+
+
+@receiver(post_migrate)
+def restore_search_index(sender, using, **kwargs):
+    if sender.name == 'reviews':
+        repair_search_index(connections[using])
@@ -0,0 +1,10 @@
+from itertools import islice
+
+
+def chunked(iterable, size):
+    """Разбивает итерируемый объект на списки длиной ``size``."""
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
@@ -1,9 +1,43 @@
 import sys
 from os.path import abspath, dirname, join
 
+import pytest
+from django.conf import settings
+from api.authentication import user_cache
+from django.core.cache import cache
+from django.db import connections
+
 root_dir = dirname(dirname(abspath(__file__)))
 sys.path.append(root_dir)
 infra_dir_path = join(root_dir, 'infra')
 
+# Тесты с базой данных работают на SQLite в памяти; вторая база
+# нужна тестам маршрутизации чтения на реплику.
+settings.DATABASES = connections.databases = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
+}
+del connections['default']
+
 pytest_plugins = [
+    'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_data',
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    user_cache.clear()
+
+
+@pytest.fixture
+def cached_users(monkeypatch):
+    """Кэш пользователей, выключенный без общего кэша."""
+    monkeypatch.setattr(user_cache, 'maxsize', 10000)
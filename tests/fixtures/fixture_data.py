@@ -0,0 +1,67 @@
+import pytest
+from reviews.models import Category, Comment, Genre, Review, Title
+
+
+@pytest.fixture
+def category():
+    return Category.objects.create(name='Фильм', slug='movie')
+
+
+@pytest.fixture
+def genres():
+    return [
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+
+
+@pytest.fixture
+def title(category, genres):
+    title = Title.objects.create(
+        name='Поезд на юг', year=1999, category=category,
+        description='Описание'
+    )
+    title.genre.set(genres)
+    return title
+
+
+@pytest.fixture
+def titles(category, genres):
+    titles = []
+    for number in range(12):
+        title = Title.objects.create(
+            name=f'Произведение {number}', year=2000 + number,
+            category=category
+        )
+        title.genre.set(genres)
+        titles.append(title)
+    return titles
+
+
+@pytest.fixture
+def reviews(title, django_user_model):
+    reviews = []
+    for number in range(12):
+        author = django_user_model.objects.create_user(
+            username=f'reviewer{number}', email=f'reviewer{number}@yamdb.fake'
+        )
+        reviews.append(Review.objects.create(
+            title=title, author=author, text=f'Отзыв {number}',
+            score=number % 10 + 1
+        ))
+    return reviews
+
+
+@pytest.fixture
+def review(reviews):
+    return reviews[0]
+
+
+@pytest.fixture
+def comments(review, django_user_model):
+    return [
+        Comment.objects.create(
+            review=review, author=review.author, text=f'Комментарий {number}'
+        )
+        for number in range(12)
+    ]
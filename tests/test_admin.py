@@ -0,0 +1,110 @@
+import pytest
+from django.test import Client
+from reviews.admin import LargeTablePaginator
+from reviews.models import Review, Title, User
+
+
+@pytest.fixture
+def staff_client(django_user_model):
+    superuser = django_user_model.objects.create_superuser(
+        'TestSuperuser', 'superuser@yamdb.fake', None
+    )
+    client = Client()
+    client.force_login(superuser)
+    return client
+
+
+def changelist(client, model, **params):
+    return client.get(f'/admin/reviews/{model}/', params)
+
+
+def found_ids(response):
+    return {obj.pk for obj in response.context['cl'].result_list}
+
+
+@pytest.mark.django_db
+class TestAdminChangelist:
+
+    @pytest.mark.parametrize('model', (
+        'user', 'title', 'review', 'comment', 'genretitle',
+    ))
+    def test_no_full_count(self, staff_client, reviews, comments, model,
+                           django_assert_max_num_queries):
+        with django_assert_max_num_queries(8) as context:
+            response = changelist(staff_client, model)
+        assert response.status_code == 200
+        counts = [
+            query['sql'] for query in context.captured_queries
+            if 'COUNT(' in query['sql']
+        ]
+        assert all('LIMIT' in sql for sql in counts), (
+            'Проверьте, что список не считает всю таблицу'
+        )
+
+    def test_review_list_is_joined(self, staff_client, reviews,
+                                   django_assert_max_num_queries):
+        with django_assert_max_num_queries(6):
+            response = changelist(staff_client, 'review')
+        assert len(response.context['cl'].result_list) == len(reviews), (
+            'Проверьте, что произведение и автор отзыва присоединяются '
+            'в том же запросе'
+        )
+
+    def test_id_search(self, staff_client, title, titles, reviews, comments):
+        response = changelist(staff_client, 'review', q=str(title.pk))
+        assert found_ids(response) == {review.pk for review in reviews}
+        response = changelist(staff_client, 'comment', q=comments[0].pk)
+        assert comments[0].pk in found_ids(response)
+
+    def test_text_search(self, staff_client, titles, user, admin):
+        response = changelist(staff_client, 'user', q=user.username[:5])
+        assert found_ids(response) == {user.pk}
+        response = changelist(staff_client, 'user', q=user.username[1:])
+        assert not found_ids(response), (
+            'Проверьте, что пользователи ищутся по началу имени'
+        )
+        response = changelist(staff_client, 'title', q=titles[0].name)
+        assert titles[0].pk in found_ids(response)
+        response = changelist(staff_client, 'review', q='текст')
+        assert not found_ids(response)
+
+    def test_change_form_widgets(self, staff_client, review, comments):
+        response = staff_client.get(
+            f'/admin/reviews/review/{review.pk}/change/'
+        )
+        assert response.status_code == 200
+        content = response.content.decode()
+        assert 'admin-autocomplete' in content, (
+            'Проверьте, что связи отзыва выбираются автодополнением, '
+            'а не списком всех объектов'
+        )
+        assert content.count('<option') < 5
+        response = staff_client.get(
+            f'/admin/reviews/comment/{comments[0].pk}/change/'
+        )
+        assert 'vForeignKeyRawIdAdminField' in response.content.decode()
+
+    def test_soft_delete(self, staff_client, title, reviews, user):
+        response = staff_client.post(
+            f'/admin/reviews/title/{title.pk}/delete/', {'post': 'yes'}
+        )
+        assert response.status_code == 302
+        assert Title.all_objects.filter(pk=title.pk, is_deleted=True).exists()
+        assert Review.objects.filter(title_id=title.pk).count() == len(
+            reviews
+        ), 'Проверьте, что отзывы удаляются командой, а не в запросе'
+        response = staff_client.post('/admin/reviews/user/', {
+            'action': 'delete_selected',
+            '_selected_action': [user.pk],
+            'post': 'yes',
+        })
+        assert response.status_code == 302
+        assert User.all_objects.get(pk=user.pk).is_deleted
+
+
+@pytest.mark.django_db
+def test_paginator_count_is_capped(settings, titles):
+    settings.ADMIN_COUNT_LIMIT = 5
+    paginator = LargeTablePaginator(Title.objects.order_by('pk'), 2)
+    assert paginator.count == 5
+    assert paginator.num_pages == 3
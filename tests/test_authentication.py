@@ -0,0 +1,69 @@
+import pytest
+from api.authentication import user_dependency
+from api.cache import bump_versions
+from reviews.models import User
+
+
+@pytest.mark.django_db
+def test_off_without_shared_cache(admin, admin_client):
+    assert admin_client.get('/api/v1/users/').status_code == 200
+    # Изменение в другом процессе: локальный кэш не сброшен.
+    User.objects.filter(pk=admin.pk).update(role='user')
+    assert admin_client.get('/api/v1/users/').status_code == 403, (
+        'Проверьте, что без общего кэша пользователь читается из базы'
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('cached_users')
+class TestCachedUserAuthentication:
+
+    def test_repeated_requests_skip_user_query(
+            self, user_client, title, django_assert_num_queries):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        user_client.get('/api/v1/users/me/')
+        with django_assert_num_queries(2):
+            response = user_client.get(url)
+        assert response.status_code == 200
+        # Запись сверяет пользователя с БД.
+        with django_assert_num_queries(6):
+            response = user_client.post(url, data={'text': 'Т', 'score': 5})
+        assert response.status_code == 201
+        assert response.json()['author'] == 'TestUser'
+
+    def test_writes_ignore_stale_entries(self, admin, admin_client):
+        assert admin_client.get('/api/v1/users/').status_code == 200
+        # Изменение в другом процессе: локальный кэш не сброшен.
+        User.objects.filter(pk=admin.pk).update(role='user')
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Книга', 'slug': 'book'}
+        )
+        assert response.status_code == 403, (
+            'Проверьте, что запись проверяет роль по базе данных'
+        )
+
+    def test_shared_version_drops_stale_entries(self, settings, user,
+                                                user_client):
+        settings.SHARED_CACHE = True
+        assert user_client.get('/api/v1/users/').status_code == 403
+        User.objects.filter(pk=user.pk).update(role='admin')
+        bump_versions(user_dependency(user.pk))
+        assert user_client.get('/api/v1/users/').status_code == 200, (
+            'Проверьте, что версия в общем кэше сбрасывает пользователя '
+            'во всех процессах'
+        )
+
+    def test_role_change_applies_immediately(self, user, user_client):
+        assert user_client.get('/api/v1/users/').status_code == 403
+        user.role = 'admin'
+        user.save()
+        assert user_client.get('/api/v1/users/').status_code == 200, (
+            'Проверьте, что смена роли сбрасывает закэшированного пользователя'
+        )
+
+    def test_inactive_and_deleted_users_rejected(self, user, user_client):
+        user.is_active = False
+        user.save()
+        assert user_client.get('/api/v1/users/me/').status_code == 401
+        user.delete()
+        assert user_client.get('/api/v1/users/me/').status_code == 401
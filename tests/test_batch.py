@@ -0,0 +1,31 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestTitleBatch:
+
+    def test_batch_keeps_order_and_reports_missing(
+            self, anon_client, titles, django_assert_num_queries):
+        ids = [titles[3].id, 999, titles[0].id, titles[3].id]
+        with django_assert_num_queries(2):
+            response = anon_client.get(
+                '/api/v1/titles/batch/?ids=' + ','.join(map(str, ids))
+            )
+        assert response.status_code == 200
+        data = response.json()
+        assert [item['id'] for item in data['results']] == [
+            titles[3].id, titles[0].id
+        ]
+        assert data['missing'] == [999]
+        detail = anon_client.get(f'/api/v1/titles/{titles[0].id}/').json()
+        assert data['results'][1] == detail, (
+            'Проверьте, что пакетный ответ совпадает с ответом по одному id'
+        )
+
+    @pytest.mark.parametrize('query', (
+        '', 'ids=a,b', 'ids=0', 'ids=-1', 'ids=99999999999999999999999',
+        'ids=' + ','.join(map(str, range(1, 202))),
+    ))
+    def test_batch_rejects_bad_ids(self, anon_client, query):
+        response = anon_client.get(f'/api/v1/titles/batch/?{query}')
+        assert response.status_code == 400
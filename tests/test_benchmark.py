@@ -0,0 +1,30 @@
+import pytest
+from api.benchmark import Benchmark
+from reviews.generator import DataGenerator
+
+
+@pytest.mark.django_db
+class TestBenchmark:
+
+    def test_run(self):
+        DataGenerator(titles=3, reviews=12, comments=15, users=10).run()
+        results = Benchmark(repeat=2, warmup=1).run()
+        assert set(results) == {
+            'title_list', 'title_list_sparse', 'title_detail', 'title_search',
+            'title_filter',
+            'review_list_first_page', 'review_list_last_page',
+            'comment_list_first_page', 'comment_list_last_page',
+            'review_create', 'signup', 'token',
+            'admin_user_list', 'admin_user_search', 'admin_title_list',
+            'admin_title_search', 'admin_review_list', 'admin_review_change',
+            'admin_comment_list', 'admin_comment_search',
+        }
+        for name, stats in results.items():
+            assert stats['runs'] == 2, name
+            assert stats['min_ms'] <= stats['median_ms'] <= stats['p95_ms']
+            assert stats['queries'] >= 1, name
+
+    def test_only(self):
+        DataGenerator(titles=2, reviews=4, comments=4, users=10).run()
+        results = Benchmark(repeat=1, warmup=0).run(only=['token'])
+        assert list(results) == ['token']
@@ -0,0 +1,149 @@
+import datetime
+import decimal
+import gzip
+import json
+import uuid
+
+import brotli
+import pytest
+from api.benchmark import RenderingBenchmark
+from api.renderers import FastJSONRenderer
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from django.utils.functional import lazy
+from rest_framework.renderers import JSONRenderer
+from reviews.generator import DataGenerator
+
+from api_yamdb.middleware import CompressionMiddleware, accepted_encodings
+
+
+class TestFastJSONRenderer:
+
+    @pytest.mark.parametrize('data', (
+        {'text': 'Кавычки " и \\ слеш\n\tперевод\x00\x1f'},
+        {'text': 'Разделители\u2028строк\u2029абзацев'},
+        {'score': 7.5, 'rating': None, 'flags': [True, False], 'big': 2 ** 60},
+        [{'pub_date': '2020-01-01T00:00:00Z', 'genre': []}],
+        {'emoji': '🎬', 'nested': {'deep': [[1, 2], {'a': 'б'}]}},
+    ))
+    def test_same_bytes(self, data):
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(
+            data
+        ), 'Проверьте, что FastJSONRenderer отдаёт тот же JSON, что DRF'
+
+    def test_unknown_types(self):
+        data = {
+            'date': datetime.datetime(2020, 1, 2, 3, 4, 5, 600000),
+            'decimal': decimal.Decimal('1.50'),
+            'uuid': uuid.UUID(int=1),
+            'lazy': lazy(lambda: 'ленивая', str)(),
+        }
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_indent_falls_back(self):
+        data = {'a': [1, 2]}
+        assert FastJSONRenderer().render(
+            data, 'application/json; indent=2'
+        ) == JSONRenderer().render(data, 'application/json; indent=2')
+
+    def test_none(self):
+        assert FastJSONRenderer().render(None) == b''
+
+
+def response_of(content, **headers):
+    def get_response(request):
+        response = HttpResponse(content)
+        for name, value in headers.items():
+            response[name] = value
+        return response
+    return CompressionMiddleware(get_response)
+
+
+def request_accepting(encoding):
+    return RequestFactory().get('/', HTTP_ACCEPT_ENCODING=encoding)
+
+
+class TestCompressionMiddleware:
+    content = json.dumps([{'text': 'Текст отзыва'}] * 200).encode()
+
+    @pytest.mark.parametrize('header, expected', (
+        ('gzip, deflate, br', {'gzip', 'deflate', 'br'}),
+        ('br;q=0, gzip;q=0.5', {'gzip'}),
+        ('GZIP ; q=1.0', {'gzip'}),
+        ('br;q=oops', set()),
+        ('', set()),
+    ))
+    def test_accepted_encodings(self, header, expected):
+        assert accepted_encodings(header) == expected
+
+    def test_brotli_preferred(self):
+        response = response_of(self.content)(request_accepting('gzip, br'))
+        assert response['Content-Encoding'] == 'br'
+        assert response['Vary'] == 'Accept-Encoding'
+        assert int(response['Content-Length']) == len(response.content)
+        assert brotli.decompress(response.content) == self.content
+
+    def test_gzip(self):
+        response = response_of(self.content)(
+            request_accepting('gzip, br;q=0')
+        )
+        assert response['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.content) == self.content
+
+    def test_identity(self):
+        response = response_of(self.content)(request_accepting('identity'))
+        assert not response.has_header('Content-Encoding')
+        assert response['Vary'] == 'Accept-Encoding'
+        assert response.content == self.content
+
+    def test_small_response(self, settings):
+        settings.COMPRESSION_MIN_SIZE = len(self.content) + 1
+        response = response_of(self.content)(request_accepting('br'))
+        assert not response.has_header('Content-Encoding')
+        assert not response.has_header('Vary'), (
+            'Проверьте, что короткие ответы не сжимаются'
+        )
+
+    def test_already_encoded(self):
+        response = response_of(self.content, **{
+            'Content-Encoding': 'identity'
+        })(request_accepting('br'))
+        assert response['Content-Encoding'] == 'identity'
+        assert response.content == self.content
+
+    def test_weak_etag(self):
+        response = response_of(self.content, ETag='"abc"')(
+            request_accepting('gzip')
+        )
+        assert response['ETag'] == 'W/"abc"'
+
+    def test_streaming_gzip(self):
+        middleware = CompressionMiddleware(
+            lambda request: StreamingHttpResponse(iter([self.content] * 3))
+        )
+        response = middleware(request_accepting('br, gzip'))
+        assert response['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(
+            b''.join(response.streaming_content)
+        ) == self.content * 3
+
+    @pytest.mark.django_db
+    def test_api_response(self, settings, anon_client, titles):
+        settings.COMPRESSION_MIN_SIZE = 100
+        response = anon_client.get(
+            '/api/v1/titles/', HTTP_ACCEPT_ENCODING='br'
+        )
+        assert response['Content-Encoding'] == 'br'
+        assert json.loads(brotli.decompress(response.content))['count'] == 12
+
+
+@pytest.mark.django_db
+class TestRenderingBenchmark:
+
+    def test_run(self):
+        DataGenerator(titles=3, reviews=12, comments=0, users=10).run()
+        results = RenderingBenchmark(repeat=2).run()
+        assert set(results) == {'title_list', 'review_list'}
+        for stats in results.values():
+            assert stats['bytes']['gzip'] < stats['bytes']['json']
+            assert stats['ms']['render_fast'] is not None
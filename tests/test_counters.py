@@ -0,0 +1,88 @@
+import pytest
+from django.core.management import CommandError, call_command
+from reviews.counters import find_comments_count_mismatches
+from reviews.models import Comment, Review, Title
+
+
+def _comments_count(review):
+    return Review.objects.get(pk=review.pk).comments_count
+
+
+@pytest.mark.django_db
+class TestCommentsCount:
+
+    def test_follows_comment_writes(self, review, user):
+        first = Comment.objects.create(review=review, author=user, text='1')
+        Comment.objects.create(review=review, author=user, text='2')
+        assert _comments_count(review) == 2
+        first = Comment.objects.get(pk=first.pk)
+        first.text = 'Исправлено'
+        first.save()
+        assert _comments_count(review) == 2
+        first.delete()
+        assert _comments_count(review) == 1, (
+            'Проверьте, что удаление комментария уменьшает счётчик отзыва'
+        )
+
+    def test_follows_review_change(self, reviews, user):
+        comment = Comment.objects.create(
+            review=reviews[0], author=user, text='Текст'
+        )
+        comment = Comment.objects.get(pk=comment.pk)
+        comment.review = reviews[1]
+        comment.save()
+        assert _comments_count(reviews[0]) == 0
+        assert _comments_count(reviews[1]) == 1
+
+    def test_follows_cascades(self, reviews, user):
+        Comment.objects.create(review=reviews[1], author=user, text='Чужой')
+        Comment.objects.create(
+            review=reviews[1], author=reviews[2].author, text='Свой'
+        )
+        user.delete()
+        assert _comments_count(reviews[1]) == 1, (
+            'Проверьте, что каскадное удаление комментариев обновляет счётчик'
+        )
+        reviews[0].title.delete()
+        assert not Review.objects.exists()
+
+    def test_review_destroy_is_batched(self, moderator_client, title, review,
+                                       comments,
+                                       django_assert_max_num_queries):
+        with django_assert_max_num_queries(16):
+            response = moderator_client.delete(
+                f'/api/v1/titles/{title.id}/reviews/{review.id}/'
+            )
+        assert response.status_code == 204
+        assert not Comment.objects.filter(review_id=review.id).exists()
+        assert Title.objects.get(pk=title.pk).reviews_count == (
+            title.reviews.count()
+        ), (
+            'Проверьте, что удаление отзыва сдвигает счётчики произведения'
+        )
+
+    def test_api(self, anon_client, title, review, comments):
+        response = anon_client.get(f'/api/v1/titles/{title.id}/')
+        assert response.json()['reviews_count'] == title.reviews.count()
+        response = anon_client.get(
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/'
+        )
+        assert response.json()['comments_count'] == len(comments)
+        response = anon_client.get(f'/api/v1/titles/{title.id}/reviews/')
+        counts = {
+            item['id']: item['comments_count']
+            for item in response.json()['results']
+        }
+        assert counts[review.id] == len(comments)
+
+    def test_reconcile_command(self, title, review, comments):
+        Review.objects.update(comments_count=0)
+        Title.objects.update(reviews_count=0)
+        with pytest.raises(CommandError):
+            call_command('reconcile_counters', check=True)
+        call_command('reconcile_counters')
+        assert not find_comments_count_mismatches().exists()
+        assert _comments_count(review) == len(comments)
+        assert Title.objects.get(pk=title.pk).reviews_count == (
+            title.reviews.count()
+        )
@@ -0,0 +1,115 @@
+import time
+
+import pytest
+from api import db_pool
+from api.db_pool import (check_connections, connection_stats,
+                         mark_connections_used)
+
+
+class FakeConnection:
+
+    def __init__(self, alias, usable=True, open=True):
+        self.alias = alias
+        self.connection = object() if open else None
+        self.in_atomic_block = False
+        self.usable = usable
+        self.checks = 0
+
+    def is_usable(self):
+        self.checks += 1
+        return self.usable
+
+    def close(self):
+        self.connection = None
+
+
+class FakeConnections:
+
+    def __init__(self, *wrappers):
+        self.wrappers = wrappers
+
+    def all(self):
+        return list(self.wrappers)
+
+
+@pytest.fixture
+def stats():
+    connection_stats.clear()
+    yield connection_stats
+    connection_stats.clear()
+
+
+class TestConnectionHealth:
+
+    def test_check_connections(self, stats, settings, monkeypatch):
+        settings.DB_HEALTH_CHECKS = True
+        alive = FakeConnection('default')
+        stale = FakeConnection('replica', usable=False)
+        closed = FakeConnection('other', open=False)
+        monkeypatch.setattr(
+            db_pool, 'connections', FakeConnections(alive, stale, closed)
+        )
+
+        check_connections()
+
+        assert alive.connection is not None
+        assert stale.connection is None, (
+            'Проверьте, что неработающее соединение закрывается'
+        )
+        assert stats.snapshot() == {
+            'default': {'opened': 0, 'reused': 1, 'discarded': 0},
+            'replica': {'opened': 0, 'reused': 0, 'discarded': 1},
+        }
+
+    def test_health_checks_disabled(self, stats, settings, monkeypatch):
+        settings.DB_HEALTH_CHECKS = False
+        stale = FakeConnection('default', usable=False)
+        monkeypatch.setattr(db_pool, 'connections', FakeConnections(stale))
+
+        check_connections()
+
+        assert stale.connection is not None
+        assert stats.snapshot()['default']['reused'] == 1
+
+    def test_recently_used_not_checked(self, stats, settings, monkeypatch):
+        settings.DB_HEALTH_CHECKS = True
+        settings.DB_HEALTH_CHECK_IDLE = 30
+        recent = FakeConnection('default')
+        idle = FakeConnection('replica')
+        monkeypatch.setattr(
+            db_pool, 'connections', FakeConnections(recent, idle)
+        )
+        mark_connections_used()
+        idle.last_used = time.monotonic() - 60
+
+        check_connections()
+
+        assert recent.checks == 0, (
+            'Проверьте, что недавно занятое соединение не проверяется '
+            'отдельным запросом'
+        )
+        assert idle.checks == 1
+        assert stats.snapshot()['default']['reused'] == 1
+
+
+@pytest.mark.django_db
+class TestDatabaseDiagnostics:
+    url = '/api/v1/diagnostics/db/'
+
+    def test_permissions(self, anon_client, user_client):
+        assert anon_client.get(self.url).status_code == 401
+        assert user_client.get(self.url).status_code == 403
+
+    def test_counters(self, stats, admin_client):
+        stats.increment('default', 'opened')
+        response = admin_client.get(self.url)
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data) == {'pid', 'health_checks', 'databases'}
+        assert data['databases']['default'] == {
+            'conn_max_age': 0,
+            'is_open': True,
+            'opened': 1,
+            'reused': 0,
+            'discarded': 0,
+        }, 'Проверьте, что эндпоинт отдаёт счётчики соединений воркера'
@@ -0,0 +1,43 @@
+import csv
+import io
+import json
+
+import pytest
+
+
+def _content(response):
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestTitleExport:
+
+    def test_ndjson_export(self, admin_client, titles, reviews,
+                           django_assert_max_num_queries):
+        with django_assert_max_num_queries(3):
+            response = admin_client.get('/api/v1/titles/export/')
+            lines = _content(response).splitlines()
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        rows = [json.loads(line) for line in lines]
+        assert len(rows) == len(titles) + 1
+        rated = next(row for row in rows if row['reviews_count'])
+        assert rated['rating'] == pytest.approx(
+            sum(review.score for review in reviews) / len(reviews)
+        )
+        assert rows[0]['genre'] == ['comedy', 'drama']
+        assert rows[0]['category'] == 'movie'
+
+    def test_csv_export_with_filter(self, admin_client, titles):
+        response = admin_client.get(
+            '/api/v1/titles/export/?type=csv&year=2003'
+        )
+        rows = list(csv.DictReader(io.StringIO(_content(response))))
+        assert [row['name'] for row in rows] == ['Произведение 3']
+        assert rows[0]['genre'] == 'comedy,drama'
+
+    def test_export_requires_admin(self, user_client, admin_client):
+        assert user_client.get('/api/v1/titles/export/').status_code == 403
+        assert admin_client.get(
+            '/api/v1/titles/export/?type=xml'
+        ).status_code == 400
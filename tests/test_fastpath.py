@@ -0,0 +1,136 @@
+import pytest
+from api.fastpath import (UnsupportedSerializerError, ValuesListMixin,
+                          ValuesMapper)
+from api.serializers import (CommentSerializer, ReadOnlyTitleSerializer,
+                             ReviewSerializer)
+from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from reviews.models import Comment, Review, Title
+
+
+@pytest.fixture
+def catalog(titles, reviews, comments, genres):
+    """Произведения с пустыми полями, дробным рейтингом и без жанров."""
+    bare = Title.objects.create(name='Без категории', year=1980)
+    titles[0].description = 'Описание с "кавычками" и\nпереносом'
+    titles[0].save()
+    titles[1].genre.set(genres[:1])
+    titles[2].genre.clear()
+    for number, title in enumerate((titles[3], bare)):
+        for author in (review.author for review in reviews[:3 + number]):
+            Review.objects.create(
+                title=title, author=author, text='Оценка', score=7 + number
+            )
+    return titles
+
+
+@pytest.fixture
+def serializer_path(settings, monkeypatch):
+    """Переключает списки на обычный путь через сериализаторы."""
+    settings.API_CACHE_TIMEOUT = 0
+
+    def use_serializers():
+        monkeypatch.setattr(
+            ValuesListMixin, 'get_values_mapper', lambda self: None
+        )
+
+    return use_serializers
+
+
+@pytest.mark.django_db
+class TestFastPathParity:
+    """Быстрый путь списков отдаёт те же байты, что и сериализаторы."""
+
+    @pytest.mark.parametrize('url', (
+        '/api/v1/titles/',
+        '/api/v1/titles/?page=2',
+        '/api/v1/titles/?ordering=-rating',
+        '/api/v1/titles/?ordering=name',
+        '/api/v1/titles/?genre=comedy',
+        '/api/v1/titles/?category=movie',
+        '/api/v1/titles/?search=Произведение',
+        '/api/v1/titles/?year=2003',
+    ))
+    def test_title_list(self, catalog, anon_client, serializer_path, url):
+        self.assert_same_bytes(anon_client, serializer_path, url)
+
+    @pytest.mark.parametrize('query', (
+        '', '?page=2', '?pagination=cursor',
+    ))
+    def test_review_list(self, catalog, title, anon_client, serializer_path,
+                         query):
+        self.assert_same_bytes(
+            anon_client, serializer_path,
+            f'/api/v1/titles/{title.id}/reviews/{query}'
+        )
+
+    @pytest.mark.parametrize('query', (
+        '', '?page=2', '?pagination=cursor',
+    ))
+    def test_comment_list(self, catalog, title, review, anon_client,
+                          serializer_path, query):
+        self.assert_same_bytes(
+            anon_client, serializer_path,
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/{query}'
+        )
+
+    def test_cursor_next_page(self, catalog, title, anon_client,
+                              serializer_path):
+        url = f'/api/v1/titles/{title.id}/reviews/?pagination=cursor'
+        next_url = anon_client.get(url).json()['next']
+        assert next_url
+        self.assert_same_bytes(anon_client, serializer_path, next_url)
+
+    def assert_same_bytes(self, client, serializer_path, url):
+        fast = client.get(url)
+        serializer_path()
+        slow = client.get(url)
+        assert fast.status_code == slow.status_code == 200
+        assert fast.content == slow.content, (
+            f'Проверьте, что быстрый путь {url} отдаёт тот же JSON, '
+            'что и сериализатор'
+        )
+
+    @pytest.mark.parametrize('serializer_class, queryset', (
+        (ReadOnlyTitleSerializer, lambda: Title.objects.all()),
+        (ReviewSerializer, lambda: Review.objects.order_by('id')),
+        (CommentSerializer, lambda: Comment.objects.order_by('id')),
+    ))
+    def test_mapper(self, catalog, serializer_class, queryset):
+        mapper = ValuesMapper(serializer_class())
+        renderer = JSONRenderer()
+        assert renderer.render(
+            mapper.represent(mapper.values(queryset()))
+        ) == renderer.render(serializer_class(queryset(), many=True).data)
+
+
+class TestValuesMapper:
+
+    def test_unsupported_fields(self):
+        class MethodSerializer(serializers.ModelSerializer):
+            extra = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Comment
+                fields = ('id', 'extra')
+
+        with pytest.raises(UnsupportedSerializerError):
+            ValuesMapper(MethodSerializer())
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('view_class, serializer_class', (
+        (TitleViewSet, ReadOnlyTitleSerializer),
+        (ReviewViewSet, ReviewSerializer),
+        (CommentViewSet, CommentSerializer),
+    ))
+    def test_views_compile_mapper(self, catalog, title, review, anon_client,
+                                  view_class, serializer_class):
+        anon_client.get('/api/v1/titles/')
+        anon_client.get(f'/api/v1/titles/{title.id}/reviews/')
+        anon_client.get(
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        )
+        assert isinstance(
+            view_class._values_mappers[serializer_class, None], ValuesMapper
+        ), 'Проверьте, что список отдаётся через быстрый путь'
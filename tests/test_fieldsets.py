@@ -0,0 +1,141 @@
+import pytest
+from api.fastpath import ValuesListMixin
+
+
+def all_sql(queries):
+    return ' '.join(query['sql'] for query in queries)
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+
+    def test_title_list_fields(self, anon_client, titles,
+                               django_assert_max_num_queries):
+        with django_assert_max_num_queries(2) as context:
+            response = anon_client.get(
+                '/api/v1/titles/?fields=id,name,rating'
+            )
+        assert response.status_code == 200
+        assert list(response.json()['results'][0]) == ['id', 'name', 'rating']
+        sql = all_sql(context.captured_queries)
+        assert 'reviews_category' not in sql and 'reviews_genre' not in sql, (
+            'Проверьте, что незапрошенные связи не присоединяются '
+            'и не догружаются'
+        )
+        assert '"description"' not in sql
+
+    def test_title_detail_fields(self, anon_client, title,
+                                 django_assert_num_queries):
+        with django_assert_num_queries(1) as context:
+            response = anon_client.get(
+                f'/api/v1/titles/{title.id}/?fields=id,name'
+            )
+        assert response.json() == {'id': title.id, 'name': title.name}
+        sql = context.captured_queries[0]['sql']
+        assert 'JOIN' not in sql and '"description"' not in sql, (
+            'Проверьте, что лишние колонки откладываются'
+        )
+
+    def test_title_detail_expand(self, anon_client, title):
+        response = anon_client.get(
+            f'/api/v1/titles/{title.id}/?fields=genre,category&expand=genre'
+        )
+        assert response.json() == {
+            'genre': [
+                {'name': genre.name, 'slug': genre.slug}
+                for genre in title.genre.order_by('name')
+            ],
+            'category': title.category.slug,
+        }, 'Проверьте, что неразвёрнутые связи отдаются слагами'
+
+    def test_default_expands_everything(self, anon_client, title):
+        response = anon_client.get(
+            f'/api/v1/titles/{title.id}/?fields=category'
+        )
+        assert response.json() == {'category': {
+            'name': title.category.name, 'slug': title.category.slug,
+        }}
+
+    @pytest.mark.parametrize('query', (
+        '?fields=id,genre,category&expand=category',
+        '?expand=',
+        '?fields=name,year,description&ordering=-year',
+        '?fields=genre&genre=comedy',
+    ))
+    def test_title_list_matches_serializer(self, settings, monkeypatch,
+                                           anon_client, titles, query):
+        settings.API_CACHE_TIMEOUT = 0
+        url = f'/api/v1/titles/{query}'
+        fast = anon_client.get(url)
+        monkeypatch.setattr(
+            ValuesListMixin, 'get_values_mapper', lambda self: None
+        )
+        slow = anon_client.get(url)
+        assert fast.status_code == slow.status_code == 200
+        assert fast.content == slow.content
+
+    def test_review_list_fields(self, anon_client, title, reviews,
+                                django_assert_max_num_queries):
+        with django_assert_max_num_queries(3) as context:
+            response = anon_client.get(
+                f'/api/v1/titles/{title.id}/reviews/?fields=id,score'
+            )
+        assert response.status_code == 200
+        assert set(response.json()['results'][0]) == {'id', 'score'}
+        queries = context.captured_queries
+        assert '"reviews_user"."username"' not in queries[-1]['sql']
+
+    def test_review_detail_fields(self, anon_client, title, review,
+                                  django_assert_num_queries):
+        with django_assert_num_queries(2) as context:
+            response = anon_client.get(
+                f'/api/v1/titles/{title.id}/reviews/{review.id}/?fields=id'
+            )
+        assert response.json() == {'id': review.id}, (
+            'Проверьте, что отложенные поля не догружаются по одному'
+        )
+        sql = context.captured_queries[-1]['sql']
+        assert '"username"' not in sql and '"text"' not in sql, (
+            'Проверьте, что вложенный список тоже сокращает запрос'
+        )
+
+    def test_comment_detail_fields(self, anon_client, title, review,
+                                   comments, django_assert_num_queries):
+        with django_assert_num_queries(2) as context:
+            response = anon_client.get(
+                f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+                f'{comments[0].id}/?fields=author'
+            )
+        assert response.json() == {'author': comments[0].author.username}
+        sql = context.captured_queries[-1]['sql']
+        assert '"text"' not in sql and '"pub_date"' not in sql
+
+    @pytest.mark.parametrize('path', ('reviews', 'comments'))
+    def test_cursor_with_fields(self, anon_client, title, review, reviews,
+                                comments, path):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        if path == 'comments':
+            url += f'{review.id}/comments/'
+        response = anon_client.get(f'{url}?pagination=cursor&fields=id')
+        assert response.status_code == 200
+        data = response.json()
+        assert all(list(row) == ['id'] for row in data['results']), (
+            'Проверьте, что поля сортировки не попадают в ответ'
+        )
+        assert data['next']
+
+    @pytest.mark.parametrize('query, error', (
+        ('?fields=id,password', 'fields'),
+        ('?expand=author', 'expand'),
+    ))
+    def test_unknown_names(self, anon_client, title, query, error):
+        response = anon_client.get(f'/api/v1/titles/{title.id}/{query}')
+        assert response.status_code == 400
+        assert error in response.json()
+
+    def test_cached_separately(self, settings, anon_client, titles):
+        settings.API_CACHE_TIMEOUT = 60
+        full = anon_client.get('/api/v1/titles/')
+        sparse = anon_client.get('/api/v1/titles/?fields=id')
+        assert list(sparse.json()['results'][0]) == ['id']
+        assert full.content != sparse.content
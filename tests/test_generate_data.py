@@ -0,0 +1,107 @@
+import io
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Count
+from reviews.counters import find_comments_count_mismatches
+from reviews.generator import DataGenerator, allocate
+from reviews.models import Comment, GenreTitle, Review, Title, User
+from reviews.ratings import find_rating_mismatches
+
+
+class TestAllocate:
+
+    def test_total_is_kept(self):
+        counts = allocate(100, [5, 3, 1, 1])
+        assert sum(counts) == 100
+        assert counts == sorted(counts, reverse=True)
+
+    def test_cap(self):
+        counts = allocate(10, [100, 1, 1], cap=4)
+        assert counts == [4, 3, 3]
+
+    def test_zero_weight(self):
+        assert allocate(5, [0, 2, 0, 1]) == [0, 4, 0, 1]
+
+    def test_cap_too_small(self):
+        with pytest.raises(ValueError):
+            allocate(10, [1, 1], cap=4)
+
+
+@pytest.mark.django_db
+class TestGenerateData:
+
+    def test_generate(self):
+        written = DataGenerator(
+            titles=20, reviews=400, comments=600, users=50, batch_size=64
+        ).run()
+        assert written == {
+            'categories': 10, 'genres': 30, 'users': 50, 'titles': 20,
+            'genre_titles': GenreTitle.objects.count(),
+            'reviews': 400, 'comments': 600,
+        }
+        assert Title.objects.count() == 20
+        assert Review.objects.count() == 400
+        assert Comment.objects.count() == 600
+        assert not Review.objects.values('author', 'title').annotate(
+            total=Count('id')
+        ).filter(total__gt=1).exists(), (
+            'Проверьте, что пользователь оставляет не больше одного '
+            'отзыва на произведение'
+        )
+        assert not find_rating_mismatches().exists(), (
+            'Проверьте, что рейтинги созданных произведений согласованы '
+            'с отзывами'
+        )
+        assert not find_comments_count_mismatches().exists(), (
+            'Проверьте, что число комментариев отзывов согласовано'
+        )
+        assert set(Review.objects.values_list('score', flat=True)) <= set(
+            range(1, 11)
+        )
+
+    def test_popularity_is_skewed(self):
+        DataGenerator(titles=50, reviews=2000, comments=0, users=1000).run()
+        counts = sorted(
+            Title.objects.values_list('reviews_count', flat=True),
+            reverse=True
+        )
+        assert sum(counts[:5]) > sum(counts) / 3, (
+            'Проверьте, что несколько произведений собирают большую '
+            'часть отзывов'
+        )
+
+    def test_deterministic(self):
+        def snapshot():
+            return list(Review.objects.order_by('id').values_list(
+                'title_id', 'author_id', 'score', 'pub_date'
+            ))
+
+        DataGenerator(titles=10, reviews=100, comments=0, seed=3).run()
+        first = snapshot()
+        Review.objects.all().delete()
+        Title.objects.all().delete()
+        User.objects.all().delete()
+        DataGenerator(titles=10, reviews=100, comments=0, seed=3).run()
+        second = snapshot()
+        offset = second[0][0] - first[0][0], second[0][1] - first[0][1]
+        assert [
+            (title - offset[0], author - offset[1], score, pub_date)
+            for title, author, score, pub_date in second
+        ] == first, 'Проверьте, что одно зерно даёт одинаковые данные'
+
+    def test_new_rows_continue_sequences(self, title, user):
+        DataGenerator(titles=2, reviews=4, comments=2, users=5).run()
+        created = Title.objects.create(name='После генерации', year=2000)
+        assert created.pk == Title.objects.order_by('-pk')[1].pk + 1
+
+    def test_command(self):
+        call_command(
+            'generate_data', titles=5, reviews=50, comments=20, users=20,
+            stdout=io.StringIO()
+        )
+        assert Review.objects.count() == 50
+
+    def test_command_rejects_too_few_users(self):
+        with pytest.raises(CommandError):
+            call_command('generate_data', titles=2, reviews=50, users=3)
@@ -0,0 +1,91 @@
+import io
+
+import pytest
+from django.core.management import CommandError, call_command
+from reviews.importer import CsvImporter
+from reviews.models import Category, Comment, Review, Title
+from reviews.ratings import find_rating_mismatches
+
+FILES = {
+    'users.csv': (
+        'id,username,email,role,bio,first_name,last_name\n'
+        '100,alice,alice@yamdb.fake,user,,,\n'
+        '101,bob,bob@yamdb.fake,moderator,,,\n'
+    ),
+    'category.csv': 'id,name,slug\n1,Фильм,movie\n',
+    'genre.csv': 'id,name,slug\n1,Драма,drama\n',
+    'titles.csv': (
+        'id,name,year,category\n'
+        '1,Первый,1999,1\n'
+        '2,Второй,2001,\n'
+    ),
+    'genre_title.csv': 'id,title_id,genre_id\n1,1,1\n2,2,1\n',
+    'review.csv': (
+        'id,title_id,text,author,score,pub_date\n'
+        '1,1,Хорошо,100,8,2019-09-24T21:08:21.567Z\n'
+        '2,1,Плохо,101,2,2019-09-25T21:08:21.567Z\n'
+        '3,7,Нет произведения,100,5,2019-09-25T21:08:21.567Z\n'
+    ),
+    'comments.csv': (
+        'id,review_id,text,author,pub_date\n'
+        '1,1,Согласен,101,2019-09-26T21:08:21.567Z\n'
+    ),
+}
+
+
+@pytest.mark.django_db
+class TestImportCsv:
+
+    def test_import_directory(self, tmp_path, anon_client):
+        for name, content in FILES.items():
+            (tmp_path / name).write_text(content, encoding='utf-8')
+        anon_client.get('/api/v1/titles/1/')
+        call_command('import_csv', str(tmp_path), batch_size=2)
+
+        assert Review.objects.count() == 2, (
+            'Проверьте, что строки с несуществующими ссылками пропускаются'
+        )
+        first = Title.objects.get(pk=1)
+        assert (first.reviews_count, first.rating) == (2, 5)
+        assert Review.objects.get(pk=1).pub_date.year == 2019, (
+            'Проверьте, что дата публикации берётся из файла'
+        )
+        assert Comment.objects.get().author.username == 'bob'
+        response = anon_client.get('/api/v1/titles/1/')
+        assert response.json()['rating'] == 5
+
+        call_command(
+            'import_csv', str(tmp_path), only=['review.csv'],
+            ignore_conflicts=True
+        )
+        assert Review.objects.count() == 2
+
+    def test_ignore_conflicts_counts_inserted_rows(self, category):
+        stream = io.StringIO(
+            'id,name,slug\n'
+            f'{category.pk},{category.name},{category.slug}\n'
+            f'{category.pk + 1},Книга,book\n'
+        )
+        stats = CsvImporter(Category, ignore_conflicts=True).run(stream)
+        assert (stats.created, stats.skipped) == (1, 1), (
+            'Проверьте, что конфликтующие строки не считаются созданными'
+        )
+
+    def test_failed_import_keeps_counters(self, tmp_path, title, reviews,
+                                          admin):
+        (tmp_path / 'review.csv').write_text(
+            'id,title_id,text,author,score,pub_date\n'
+            f'100,{title.pk},Хорошо,{admin.pk},1,2019-09-24T21:08:21.567Z\n'
+            f'101,{title.pk},Плохо,{admin.pk},zz,2019-09-25T21:08:21.567Z\n',
+            encoding='utf-8'
+        )
+        with pytest.raises(CommandError):
+            call_command(
+                'import_csv', str(tmp_path), only=['review.csv'],
+                batch_size=1
+            )
+        assert Review.objects.count() == len(reviews) + 1
+        assert Title.objects.get(pk=title.pk).reviews_count == len(
+            reviews
+        ) + 1, 'Проверьте, что рейтинг пересчитывается и после ошибки'
+        assert not find_rating_mismatches().exists()
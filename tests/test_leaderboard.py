@@ -0,0 +1,60 @@
+import pytest
+from reviews.models import Review, Title
+
+
+@pytest.fixture
+def rated_titles(titles, django_user_model):
+    authors = [
+        django_user_model.objects.create_user(
+            username=f'critic{number}', email=f'critic{number}@yamdb.fake'
+        )
+        for number in range(3)
+    ]
+    scores = {0: (9, 9, 9), 1: (10, 10), 2: (5, 6, 7), 3: (8, 8, 8)}
+    for index, title_scores in scores.items():
+        for author, score in zip(authors, title_scores):
+            Review.objects.create(
+                title=titles[index], author=author, text='Т', score=score
+            )
+    return titles
+
+
+@pytest.mark.django_db
+class TestLeaderboard:
+
+    def test_top_skips_thinly_reviewed(self, anon_client, rated_titles,
+                                       django_assert_num_queries):
+        with django_assert_num_queries(2):
+            response = anon_client.get('/api/v1/titles/top/?limit=2')
+        assert response.status_code == 200
+        assert [item['name'] for item in response.json()] == [
+            rated_titles[0].name, rated_titles[3].name
+        ], 'Проверьте, что в рейтинг не попадают произведения с 2 отзывами'
+
+    def test_top_filters(self, anon_client, rated_titles):
+        response = anon_client.get(
+            f'/api/v1/titles/top/?year={rated_titles[2].year}'
+        )
+        assert [item['id'] for item in response.json()] == [
+            rated_titles[2].id
+        ]
+        assert anon_client.get(
+            '/api/v1/titles/top/?genre=drama&limit=1'
+        ).json()[0]['id'] == rated_titles[0].id
+        assert anon_client.get(
+            '/api/v1/titles/top/?limit=1000'
+        ).status_code == 400
+
+    def test_top_follows_review_writes(self, anon_client, rated_titles):
+        Review.objects.filter(title=rated_titles[0]).delete()
+        response = anon_client.get('/api/v1/titles/top/?limit=1')
+        assert response.json()[0]['id'] == rated_titles[3].id
+        assert Title.objects.get(pk=rated_titles[0].pk).ranked_rating is None
+
+    def test_list_ordering_by_rating(self, anon_client, rated_titles):
+        response = anon_client.get('/api/v1/titles/?ordering=-rating')
+        ratings = [item['rating'] for item in response.json()['results']]
+        assert ratings[:4] == [10, 9, 8, 6]
+        assert ratings[-1] is None, (
+            'Проверьте, что произведения без оценок идут в конце'
+        )
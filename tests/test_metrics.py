@@ -0,0 +1,81 @@
+import pytest
+from api.views import APISignup, TitleViewSet
+from prometheus_client import REGISTRY
+
+from api_yamdb.metrics import view_label
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db
+class TestPrometheusMetrics:
+
+    def test_request_metrics(self, anon_client, category):
+        labels = {
+            'view': 'CategoryViewSet.list', 'method': 'GET', 'status': '200'
+        }
+        requests = sample('yamdb_http_requests_total', **labels)
+        latency = sample('yamdb_http_request_duration_seconds_count', **labels)
+        queries = sample(
+            'yamdb_db_queries_per_request_sum', view='CategoryViewSet.list'
+        )
+
+        anon_client.get('/api/v1/categories/')
+
+        assert sample('yamdb_http_requests_total', **labels) == (
+            requests + 1
+        ), 'Проверьте, что запрос учитывается с меткой представления'
+        assert sample(
+            'yamdb_http_request_duration_seconds_count', **labels
+        ) == latency + 1
+        assert sample(
+            'yamdb_db_queries_per_request_sum', view='CategoryViewSet.list'
+        ) == queries + 2, 'Проверьте, что учитывается число запросов к БД'
+
+    def test_unresolved_request(self, anon_client):
+        labels = {'view': 'unresolved', 'method': 'GET', 'status': '404'}
+        before = sample('yamdb_http_requests_total', **labels)
+        anon_client.get('/nonexistent/')
+        assert sample('yamdb_http_requests_total', **labels) == before + 1
+
+    def test_response_cache_hits(self, settings, anon_client, category):
+        settings.API_CACHE_TIMEOUT = 300
+        hits = sample(
+            'yamdb_cache_requests_total', cache='response', result='hit'
+        )
+        misses = sample(
+            'yamdb_cache_requests_total', cache='response', result='miss'
+        )
+        anon_client.get('/api/v1/categories/')
+        anon_client.get('/api/v1/categories/')
+        assert sample(
+            'yamdb_cache_requests_total', cache='response', result='hit'
+        ) == hits + 1
+        assert sample(
+            'yamdb_cache_requests_total', cache='response', result='miss'
+        ) == misses + 1
+
+    def test_metrics_endpoint(self, anon_client, category):
+        anon_client.get('/api/v1/categories/')
+        response = anon_client.get('/metrics')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        body = response.content.decode()
+        assert (
+            'yamdb_http_requests_total{method="GET",status="200",'
+            'view="CategoryViewSet.list"}'
+        ) in body, 'Проверьте, что /metrics отдаёт метрики в формате Prometheus'
+        assert 'yamdb_http_request_duration_seconds_bucket' in body
+
+
+class TestViewLabel:
+
+    def test_viewset_action(self):
+        view = TitleViewSet.as_view({'get': 'list', 'post': 'create'})
+        assert view_label(view, 'GET') == 'TitleViewSet.list'
+        assert view_label(view, 'POST') == 'TitleViewSet.create'
+
+    def test_api_view(self):
+        assert view_label(APISignup.as_view(), 'POST') == 'APISignup'
@@ -0,0 +1,54 @@
+import pytest
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('cached_users')
+class TestNestedRoutes:
+    """Родительские объекты загружаются не больше одного раза."""
+
+    def test_review_routes(self, user_client, title, reviews,
+                           django_assert_num_queries):
+        user_client.get('/api/v1/users/me/')
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        with django_assert_num_queries(3):
+            assert user_client.get(url).status_code == 200
+        with django_assert_num_queries(2):
+            assert user_client.get(
+                f'{url}{reviews[0].id}/'
+            ).status_code == 200
+        with django_assert_num_queries(6):
+            response = user_client.post(url, data={'text': 'Т', 'score': 3})
+        assert response.status_code == 201
+        response = user_client.post(url, data={'text': 'Т', 'score': 3})
+        assert response.status_code == 400, (
+            'Проверьте, что второй отзыв на произведение запрещён'
+        )
+        response = user_client.patch(
+            f'{url}{reviews[0].id}/', data={'text': 'Чужой'}
+        )
+        assert response.status_code == 403
+
+    def test_comment_routes(self, user_client, title, review, comments,
+                            django_assert_num_queries):
+        user_client.get('/api/v1/users/me/')
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        with django_assert_num_queries(3):
+            assert user_client.get(url).status_code == 200
+        with django_assert_num_queries(2):
+            assert user_client.get(
+                f'{url}{comments[0].id}/'
+            ).status_code == 200
+        # Пользователь, отзыв, вставка комментария и сдвиг счётчика.
+        with django_assert_num_queries(4):
+            response = user_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == 201
+
+    def test_review_must_belong_to_title(self, anon_client, title, titles,
+                                         review):
+        url = f'/api/v1/titles/{titles[0].id}/reviews/{review.id}/'
+        assert anon_client.get(url).status_code == 404
+        assert anon_client.get(f'{url}comments/').status_code == 404, (
+            'Проверьте, что отзыв другого произведения не найден'
+        )
+        assert anon_client.get('/api/v1/titles/999/reviews/').status_code \
+            == 404
@@ -0,0 +1,62 @@
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from reviews.models import OutboxEmail
+
+
+@pytest.mark.django_db
+class TestEmailOutbox:
+
+    def test_signup_enqueues_email(self, anon_client):
+        response = anon_client.post('/api/v1/auth/signup/', data={
+            'username': 'newbie', 'email': 'newbie@yamdb.fake'
+        })
+        assert response.status_code == 200
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что регистрация не отправляет письмо синхронно'
+        )
+        email = OutboxEmail.objects.get()
+        assert email.recipient_list == ['newbie@yamdb.fake']
+
+        call_command('send_emails')
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == ['newbie@yamdb.fake']
+        email.refresh_from_db()
+        assert email.sent_at is not None
+
+        call_command('send_emails')
+        assert len(mail.outbox) == 1, 'Проверьте, что письмо не отправляется дважды'
+
+    def test_failed_email_is_retried_later(self, settings):
+        settings.EMAIL_BACKEND = 'tests.test_outbox.FailingBackend'
+        email = OutboxEmail.objects.create(
+            subject='Тема', body='Текст', from_email='admin@yamdb.com',
+            recipients='a@yamdb.fake'
+        )
+        call_command('send_emails')
+        email.refresh_from_db()
+        assert email.attempts == 1
+        assert email.sent_at is None
+        assert email.send_after > email.created
+        assert 'SMTP' in email.last_error
+
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        call_command('send_emails')
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что повторная попытка ждёт окончания задержки'
+        )
+
+
+class FailingBackend:
+
+    def __init__(self, **kwargs):
+        pass
+
+    def open(self):
+        return True
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP недоступен')
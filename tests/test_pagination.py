@@ -0,0 +1,42 @@
+import pytest
+
+
+def _walk(client, url):
+    ids = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что курсорный режим не считает COUNT(*)'
+        )
+        ids.extend(item['id'] for item in data['results'])
+        url = data['next']
+    return ids
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+
+    def test_reviews_cursor(self, anon_client, title, reviews):
+        ids = _walk(
+            anon_client,
+            f'/api/v1/titles/{title.id}/reviews/?pagination=cursor'
+        )
+        expected = sorted(
+            reviews, key=lambda review: (review.pub_date, review.id),
+            reverse=True
+        )
+        assert ids == [review.id for review in expected]
+
+    def test_comments_cursor(self, anon_client, title, review, comments):
+        ids = _walk(
+            anon_client,
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+            '?pagination=cursor'
+        )
+        assert ids == [comment.id for comment in comments]
+
+    def test_page_numbers_by_default(self, anon_client, title, reviews):
+        response = anon_client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response.json()['count'] == len(reviews)
@@ -0,0 +1,233 @@
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.pagination import PageNumberPagination
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db
+class TestQueryCounts:
+    """Число запросов к базе не зависит от размера страницы."""
+
+    @pytest.mark.parametrize('url, budget', (
+        ('/api/v1/categories/', 2),
+        ('/api/v1/genres/', 2),
+        ('/api/v1/titles/', 3),
+    ))
+    def test_catalog_lists(self, anon_client, titles, url, budget,
+                           django_assert_max_num_queries):
+        with django_assert_max_num_queries(budget):
+            response = anon_client.get(url)
+        assert response.status_code == 200
+
+    def test_title_detail(self, anon_client, title, reviews,
+                          django_assert_max_num_queries):
+        with django_assert_max_num_queries(2):
+            response = anon_client.get(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == 200
+
+    def test_review_list(self, anon_client, title, reviews,
+                         django_assert_max_num_queries):
+        with django_assert_max_num_queries(3):
+            response = anon_client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response.status_code == 200
+        assert len(response.json()['results']) == 10
+
+    def test_review_detail(self, anon_client, title, review,
+                           django_assert_max_num_queries):
+        with django_assert_max_num_queries(2):
+            response = anon_client.get(
+                f'/api/v1/titles/{title.id}/reviews/{review.id}/'
+            )
+        assert response.status_code == 200
+
+    def test_comment_list(self, anon_client, title, review, comments,
+                          django_assert_max_num_queries):
+        with django_assert_max_num_queries(3):
+            response = anon_client.get(
+                f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+            )
+        assert response.status_code == 200
+        assert len(response.json()['results']) == 10
+
+    def test_comment_detail(self, anon_client, title, review, comments,
+                            django_assert_max_num_queries):
+        with django_assert_max_num_queries(2):
+            response = anon_client.get(
+                f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+                f'{comments[0].id}/'
+            )
+        assert response.status_code == 200
+
+    def test_review_create(self, user_client, title,
+                           django_assert_max_num_queries):
+        with django_assert_max_num_queries(6):
+            response = user_client.post(
+                f'/api/v1/titles/{title.id}/reviews/',
+                data={'text': 'Отзыв', 'score': 5}
+            )
+        assert response.status_code == 201
+
+    def test_comment_create(self, user_client, title, review,
+                            django_assert_max_num_queries):
+        with django_assert_max_num_queries(4):
+            response = user_client.post(
+                f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+                data={'text': 'Комментарий'}
+            )
+        assert response.status_code == 201
+
+    def test_title_create(self, admin_client, category, genres,
+                          django_assert_max_num_queries):
+        with django_assert_max_num_queries(9):
+            response = admin_client.post('/api/v1/titles/', data={
+                'name': 'Новое', 'year': 2000, 'category': category.slug,
+                'genre': [genre.slug for genre in genres],
+            })
+        assert response.status_code == 201
+
+    def test_users(self, admin_client, reviews, django_assert_max_num_queries):
+        with django_assert_max_num_queries(3):
+            response = admin_client.get('/api/v1/users/')
+        assert response.status_code == 200
+        with django_assert_max_num_queries(2):
+            response = admin_client.get('/api/v1/users/reviewer1/')
+        assert response.status_code == 200
+        with django_assert_max_num_queries(2):
+            response = admin_client.get('/api/v1/users/me/')
+        assert response.status_code == 200
+
+    def test_category_create_and_delete(self, admin_client,
+                                        django_assert_max_num_queries):
+        with django_assert_max_num_queries(3):
+            response = admin_client.post(
+                '/api/v1/categories/', data={'name': 'Книга', 'slug': 'book'}
+            )
+        assert response.status_code == 201
+        with django_assert_max_num_queries(5):
+            response = admin_client.delete('/api/v1/categories/book/')
+        assert response.status_code == 204
+
+    def test_auth(self, anon_client, user, django_assert_max_num_queries):
+        with django_assert_max_num_queries(6):
+            response = anon_client.post('/api/v1/auth/signup/', data={
+                'username': user.username, 'email': user.email
+            })
+        assert response.status_code == 200
+        with django_assert_max_num_queries(1):
+            response = anon_client.post('/api/v1/auth/token/', data={
+                'username': user.username,
+                'confirmation_code': default_token_generator.make_token(user),
+            })
+        assert response.status_code == 201
+
+    @pytest.mark.parametrize('url', (
+        '/api/v1/categories/',
+        '/api/v1/genres/',
+        '/api/v1/titles/',
+        '/api/v1/titles/{title}/reviews/',
+        '/api/v1/titles/{title}/reviews/{review}/comments/',
+        '/api/v1/users/',
+    ))
+    def test_lists_do_not_grow_with_page(self, settings, monkeypatch,
+                                         admin_client, title, titles,
+                                         review, comments, url):
+        settings.API_CACHE_TIMEOUT = 0
+        url = url.format(title=title.id, review=review.id)
+        admin_client.get(url)
+        counts = []
+        for page_size in (2, 10):
+            monkeypatch.setattr(PageNumberPagination, 'page_size', page_size)
+            counts.append(count_queries(admin_client, url))
+        assert counts[0] == counts[1], (
+            'Проверьте, что число запросов не растёт с размером страницы'
+        )
+
+    def test_title_update_and_delete(self, admin_client, title, reviews,
+                                     django_assert_max_num_queries):
+        with django_assert_max_num_queries(5):
+            response = admin_client.patch(
+                f'/api/v1/titles/{title.id}/', data={'name': 'Другое'}
+            )
+        assert response.status_code == 200
+        with django_assert_max_num_queries(4):
+            response = admin_client.delete(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == 204
+
+    def test_review_update_and_delete(self, admin_client, title, review,
+                                      comments,
+                                      django_assert_max_num_queries):
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/'
+        with django_assert_max_num_queries(4):
+            response = admin_client.patch(url, data={'score': 1})
+        assert response.status_code == 200
+        with django_assert_max_num_queries(16):
+            response = admin_client.delete(url)
+        assert response.status_code == 204
+
+    def test_comment_update_and_delete(self, admin_client, title, review,
+                                       comments,
+                                       django_assert_max_num_queries):
+        url = (
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+            f'{comments[0].id}/'
+        )
+        with django_assert_max_num_queries(4):
+            response = admin_client.patch(url, data={'text': 'Исправлено'})
+        assert response.status_code == 200
+        with django_assert_max_num_queries(5):
+            response = admin_client.delete(url)
+        assert response.status_code == 204
+
+    def test_user_update_and_delete(self, admin_client, user, reviews,
+                                    django_assert_max_num_queries):
+        url = f'/api/v1/users/{user.username}/'
+        with django_assert_max_num_queries(5):
+            response = admin_client.patch(url, data={'bio': 'О себе'})
+        assert response.status_code == 200
+        with django_assert_max_num_queries(3):
+            response = admin_client.patch(
+                '/api/v1/users/me/', data={'bio': 'Обо мне'}
+            )
+        assert response.status_code == 200
+        # Счётчики пересчитываются по затронутым строкам целиком.
+        with django_assert_max_num_queries(7):
+            response = admin_client.delete(url)
+        assert response.status_code == 204
+
+    @pytest.mark.parametrize('size', (5, 50))
+    def test_users_bulk(self, admin_client, size,
+                        django_assert_max_num_queries):
+        payload = [
+            {'username': f'bulk{number}', 'email': f'bulk{number}@yamdb.fake'}
+            for number in range(size)
+        ]
+        with django_assert_max_num_queries(5):
+            response = admin_client.post(
+                '/api/v1/users/bulk/', data=payload, format='json'
+            )
+        assert response.status_code == 201
+
+    def test_genre_create_and_delete(self, admin_client, titles,
+                                     django_assert_max_num_queries):
+        with django_assert_max_num_queries(3):
+            response = admin_client.post(
+                '/api/v1/genres/', data={'name': 'Роман', 'slug': 'novel'}
+            )
+        assert response.status_code == 201
+        with django_assert_max_num_queries(5):
+            response = admin_client.delete('/api/v1/genres/drama/')
+        assert response.status_code == 204
+
+    def test_db_diagnostics(self, admin_client,
+                            django_assert_max_num_queries):
+        with django_assert_max_num_queries(1):
+            response = admin_client.get('/api/v1/diagnostics/db/')
+        assert response.status_code == 200
@@ -0,0 +1,62 @@
+import pytest
+from django.core.management import call_command
+from reviews.models import Review, Title
+from reviews.ratings import find_rating_mismatches
+
+
+def _refresh(title):
+    return Title.objects.get(pk=title.pk)
+
+
+@pytest.mark.django_db
+class TestTitleRating:
+
+    def test_rating_follows_review_writes(self, title, user, admin):
+        assert _refresh(title).rating is None, (
+            'Проверьте, что у произведения без отзывов рейтинг пустой'
+        )
+        first = Review.objects.create(
+            title=title, author=user, text='Текст', score=4
+        )
+        Review.objects.create(title=title, author=admin, text='Текст', score=8)
+        stored = _refresh(title)
+        assert (stored.score_sum, stored.reviews_count) == (12, 2)
+        assert stored.rating == 6
+
+        first = Review.objects.get(pk=first.pk)
+        first.score = 10
+        first.save()
+        assert _refresh(title).rating == 9, (
+            'Проверьте, что изменение оценки пересчитывает рейтинг'
+        )
+
+        first.delete()
+        stored = _refresh(title)
+        assert (stored.score_sum, stored.reviews_count) == (8, 1)
+        assert stored.rating == 8
+
+    def test_rating_follows_title_change(self, title, titles, user):
+        review = Review.objects.create(
+            title=title, author=user, text='Текст', score=7
+        )
+        review = Review.objects.get(pk=review.pk)
+        review.title = titles[0]
+        review.save()
+        assert _refresh(title).rating is None
+        assert _refresh(titles[0]).rating == 7
+
+    def test_rating_follows_cascades(self, title, reviews):
+        reviews[0].author.delete()
+        expected = [review.score for review in reviews[1:]]
+        stored = _refresh(title)
+        assert stored.reviews_count == len(expected)
+        assert stored.score_sum == sum(expected), (
+            'Проверьте, что каскадное удаление отзывов обновляет рейтинг'
+        )
+
+    def test_rebuild_command(self, title, reviews):
+        Title.objects.update(score_sum=0, reviews_count=0, rating=None)
+        assert find_rating_mismatches().exists()
+        call_command('rebuild_ratings')
+        assert not find_rating_mismatches().exists()
+        assert _refresh(title).reviews_count == len(reviews)
@@ -0,0 +1,74 @@
+import pytest
+from api_yamdb.db_router import (PrimaryReplicaRouter, RoutingState,
+                                 routing_state)
+from django.db import transaction
+from reviews.models import Category, Title
+
+
+@pytest.fixture
+def replica(settings):
+    settings.REPLICA_DATABASE = 'replica'
+    settings.REPLICA_PIN_SECONDS = 60
+
+
+@pytest.mark.django_db(
+    transaction=True, databases=['default', 'replica']
+)
+class TestReplicaRouting:
+
+    def test_safe_requests_read_replica(self, replica, anon_client,
+                                        admin_client):
+        Category.objects.using('replica').create(
+            name='Только на реплике', slug='replica-only'
+        )
+        response = anon_client.get('/api/v1/categories/')
+        assert [item['slug'] for item in response.json()['results']] == [
+            'replica-only'
+        ], 'Проверьте, что GET-запросы читают реплику'
+
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Книга', 'slug': 'book'}
+        )
+        assert response.status_code == 201
+        assert Category.objects.using('replica').filter(
+            slug='book'
+        ).count() == 0
+
+        response = admin_client.get('/api/v1/categories/')
+        assert [item['slug'] for item in response.json()['results']] == [
+            'book'
+        ], 'Проверьте, что после записи клиент читает основную базу'
+
+    def test_anonymous_writes_do_not_pin(self, replica, anon_client):
+        Category.objects.using('replica').create(
+            name='Только на реплике', slug='replica-only'
+        )
+        response = anon_client.post('/api/v1/auth/signup/', data={
+            'username': 'newcomer', 'email': 'newcomer@yamdb.fake'
+        })
+        assert response.status_code == 200
+        response = anon_client.get('/api/v1/categories/')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что запись анонимного клиента не уводит чтение '
+            'всех анонимных клиентов на основную базу'
+        )
+
+    def test_router_rules(self, replica):
+        router = PrimaryReplicaRouter()
+        assert router.db_for_read(Title) == 'default'
+        state = RoutingState(use_replica=True)
+        token = routing_state.set(state)
+        try:
+            assert router.db_for_read(Title) == 'replica'
+            with transaction.atomic():
+                assert router.db_for_read(Title) == 'default'
+            assert router.db_for_write(Title) == 'default'
+            assert router.db_for_read(Title) == 'default', (
+                'Проверьте, что после записи чтение идёт в основную базу'
+            )
+        finally:
+            routing_state.reset(token)
+
+    def test_disabled_without_replica(self, anon_client, category):
+        response = anon_client.get('/api/v1/categories/')
+        assert response.json()['count'] == 1
@@ -0,0 +1,80 @@
+import json
+import logging
+
+import pytest
+from django.core.exceptions import MiddlewareNotUsed
+
+from api_yamdb.middleware import RequestTimingMiddleware
+
+
+@pytest.fixture
+def timing(settings):
+    settings.REQUEST_TIMING = True
+    settings.SLOW_REQUEST_MS = 10 ** 6
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for metric in header.split(', '):
+        name, *params = metric.split(';')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+    return metrics
+
+
+class TestRequestTimingMiddleware:
+
+    def test_disabled(self, settings):
+        settings.REQUEST_TIMING = False
+        with pytest.raises(MiddlewareNotUsed):
+            RequestTimingMiddleware(lambda request: None)
+
+    @pytest.mark.django_db
+    def test_disabled_has_no_header(self, settings, anon_client):
+        settings.REQUEST_TIMING = False
+        response = anon_client.get('/api/v1/categories/')
+        assert 'Server-Timing' not in response
+
+    @pytest.mark.django_db
+    def test_server_timing(self, timing, anon_client, titles):
+        response = anon_client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert 'Server-Timing' in response, (
+            'Проверьте, что ответ содержит заголовок Server-Timing'
+        )
+        metrics = parse_server_timing(response['Server-Timing'])
+        assert set(metrics) == {'db', 'serializer', 'view'}
+        assert metrics['db']['desc'] == '"3 queries"', (
+            'Проверьте, что в Server-Timing передаётся число запросов к БД'
+        )
+        assert float(metrics['serializer']['dur']) > 0
+        assert (
+            float(metrics['view']['dur'])
+            >= float(metrics['db']['dur'])
+        )
+
+    @pytest.mark.django_db
+    def test_slow_request_log(self, timing, settings, anon_client, titles,
+                              caplog):
+        settings.SLOW_REQUEST_MS = 0
+        settings.SLOW_REQUEST_TOP_QUERIES = 2
+        with caplog.at_level(logging.WARNING, logger='api_yamdb.middleware'):
+            anon_client.get('/api/v1/titles/?page=2')
+        assert len(caplog.records) == 1, (
+            'Проверьте, что медленный запрос попадает в лог'
+        )
+        record = json.loads(caplog.records[0].getMessage())
+        assert record['event'] == 'slow_request'
+        assert record['path'] == '/api/v1/titles/?page=2'
+        assert record['status'] == 200
+        assert record['queries'] == 3
+        assert len(record['slowest_queries']) == 2
+        durations = [query['ms'] for query in record['slowest_queries']]
+        assert durations == sorted(durations, reverse=True)
+        assert all('SELECT' in query['sql']
+                   for query in record['slowest_queries'])
+
+    @pytest.mark.django_db
+    def test_fast_request_not_logged(self, timing, anon_client, caplog):
+        with caplog.at_level(logging.WARNING, logger='api_yamdb.middleware'):
+            anon_client.get('/api/v1/categories/')
+        assert not caplog.records
@@ -0,0 +1,69 @@
+import pytest
+from reviews.models import Category, Review
+
+
+@pytest.mark.django_db
+def test_off_without_shared_cache(anon_client, category,
+                                  django_assert_num_queries):
+    anon_client.get('/api/v1/categories/')
+    with django_assert_num_queries(2):
+        anon_client.get('/api/v1/categories/')
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+
+    @pytest.fixture(autouse=True)
+    def enable_cache(self, settings):
+        settings.API_CACHE_TIMEOUT = 300
+
+    def test_categories_served_from_cache(self, anon_client, category,
+                                          django_assert_num_queries):
+        first = anon_client.get('/api/v1/categories/')
+        with django_assert_num_queries(0):
+            second = anon_client.get('/api/v1/categories/')
+        assert second.status_code == 200
+        assert second.content == first.content
+
+        Category.objects.create(name='Книга', slug='book')
+        response = anon_client.get('/api/v1/categories/')
+        assert response.json()['count'] == 2, (
+            'Проверьте, что запись в категории сбрасывает кэш'
+        )
+
+    def test_invalid_token_is_not_served_from_cache(self, anon_client,
+                                                    category):
+        assert anon_client.get('/api/v1/categories/').status_code == 200
+        response = anon_client.get(
+            '/api/v1/categories/', HTTP_AUTHORIZATION='Bearer invalid'
+        )
+        assert response.status_code == 401, (
+            'Проверьте, что токен проверяется и при попадании в кэш'
+        )
+
+    def test_title_detail_rating_is_fresh(self, anon_client, user_client,
+                                          title, admin,
+                                          django_assert_num_queries):
+        url = f'/api/v1/titles/{title.id}/'
+        assert anon_client.get(url).json()['rating'] is None
+        with django_assert_num_queries(0):
+            anon_client.get(url)
+        user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Отзыв', 'score': 7}
+        )
+        assert anon_client.get(url).json()['rating'] == 7
+        Review.objects.create(title=title, author=admin, text='Т', score=3)
+        assert anon_client.get(url).json()['rating'] == 5
+        assert anon_client.get('/api/v1/titles/').json()[
+            'results'][0]['rating'] == 5
+
+    def test_genre_change_invalidates_titles(self, anon_client, title,
+                                             genres):
+        url = f'/api/v1/titles/{title.id}/'
+        assert len(anon_client.get(url).json()['genre']) == 2
+        title.genre.remove(genres[0])
+        assert len(anon_client.get(url).json()['genre']) == 1
+        genres[1].name = 'Новое имя'
+        genres[1].save()
+        assert anon_client.get(url).json()['genre'][0]['name'] == 'Новое имя'
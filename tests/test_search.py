@@ -0,0 +1,120 @@
+from contextlib import contextmanager
+
+import pytest
+from django.db import DatabaseError, connection
+from reviews import search
+from reviews.models import GenreTitle, Title
+
+
+@pytest.mark.django_db
+class TestTitleSearch:
+
+    def _names(self, client, query):
+        response = client.get(f'/api/v1/titles/?{query}')
+        assert response.status_code == 200
+        return [item['name'] for item in response.json()['results']]
+
+    def test_search_ranks_matches(self, anon_client, category):
+        Title.objects.create(
+            name='Побег из Шоушенка', year=1994, category=category,
+            description='Тюремная драма'
+        )
+        Title.objects.create(
+            name='Тюрьма', year=2000, category=category,
+            description='Фильм про побег из тюрьмы и снова побег'
+        )
+        Title.objects.create(name='Комедия', year=2001, category=category)
+        names = self._names(anon_client, 'search=побег')
+        assert set(names) == {'Побег из Шоушенка', 'Тюрьма'}, (
+            'Проверьте, что поиск находит слова в названии и описании'
+        )
+        assert self._names(anon_client, 'search=шоуш') == [
+            'Побег из Шоушенка'
+        ]
+
+    def test_search_follows_renames(self, anon_client, title):
+        title.name = 'Переименованное произведение'
+        title.save()
+        assert self._names(anon_client, 'search=переименованное') == [
+            title.name
+        ]
+        title.delete()
+        assert self._names(anon_client, 'search=переименованное') == []
+
+    def test_genre_filter_without_duplicates(self, anon_client, title,
+                                             genres):
+        GenreTitle.objects.create(title=title, genre=genres[0])
+        assert self._names(anon_client, 'genre=drama') == [title.name]
+        assert self._names(anon_client, 'genre=dram') == [], (
+            'Проверьте, что фильтр по жанру сравнивает slug целиком'
+        )
+        assert self._names(anon_client, 'category=movie') == [title.name]
+
+
+class FakeCursor:
+    """Курсор PostgreSQL без прав на ``CREATE EXTENSION``."""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+        if sql.startswith('CREATE EXTENSION'):
+            raise DatabaseError('permission denied to create extension')
+
+    def fetchone(self):
+        return None
+
+
+class FakePostgres:
+    alias = 'default'
+    vendor = 'postgresql'
+
+    def __init__(self):
+        self.fake_cursor = FakeCursor()
+
+    @contextmanager
+    def cursor(self):
+        yield self.fake_cursor
+
+
+@pytest.mark.django_db
+def test_postgres_index_without_pg_trgm():
+    fake = FakePostgres()
+    search.install_search_index(fake)
+    created = [
+        sql for sql in fake.fake_cursor.statements
+        if sql.startswith('CREATE INDEX')
+    ]
+    assert len(created) == len(search.PG_INDEXES), (
+        'Проверьте, что без pg_trgm остаётся полнотекстовый индекс'
+    )
+    assert not any('gin_trgm_ops' in sql for sql in created)
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'postgresql', reason='нужен PostgreSQL'
+)
+@pytest.mark.django_db
+def test_postgres_search_without_pg_trgm(monkeypatch, anon_client, title):
+    search.uninstall_search_index(connection)
+    monkeypatch.setattr(search, 'PG_TRGM', 'pg_trgm_unavailable')
+    try:
+        search.install_search_index(connection)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT indexname FROM pg_indexes WHERE tablename = %s',
+                ['reviews_title']
+            )
+            indexes = {row[0] for row in cursor.fetchall()}
+        assert set(search.PG_INDEXES) <= indexes
+        assert not set(search.PG_TRGM_INDEXES) & indexes
+        response = anon_client.get(
+            '/api/v1/titles/', {'search': title.name.split()[0]}
+        )
+        assert response.status_code == 200
+        assert response.json()['results'][0]['name'] == title.name
+    finally:
+        monkeypatch.undo()
+        search.uninstall_search_index(connection)
+        search.install_search_index(connection)
@@ -0,0 +1,171 @@
+import pytest
+from django.core.management import call_command
+from reviews.counters import find_comments_count_mismatches
+from reviews.models import Comment, Review, Title, User
+from reviews.purge import purge_deleted
+from reviews.ratings import find_rating_mismatches
+
+
+def assert_counters_consistent():
+    assert not find_rating_mismatches().exists(), (
+        'Проверьте, что рейтинги согласованы с оставшимися отзывами'
+    )
+    assert not find_comments_count_mismatches().exists(), (
+        'Проверьте, что счётчики комментариев согласованы'
+    )
+
+
+@pytest.mark.django_db
+class TestSoftDelete:
+
+    def test_title_destroy_is_constant(self, admin_client, anon_client, title,
+                                       reviews, comments,
+                                       django_assert_max_num_queries):
+        with django_assert_max_num_queries(4):
+            response = admin_client.delete(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == 204
+        assert Review.objects.filter(title=title).count() == len(reviews), (
+            'Проверьте, что отзывы удаляются не в запросе, а командой'
+        )
+        assert anon_client.get(
+            f'/api/v1/titles/{title.id}/'
+        ).status_code == 404
+        assert anon_client.get('/api/v1/titles/').json()['count'] == 0
+        assert anon_client.get(
+            f'/api/v1/titles/{title.id}/reviews/{reviews[0].id}/'
+        ).status_code == 404
+        assert Title.all_objects.filter(pk=title.pk, is_deleted=True).exists()
+
+    def test_user_destroy(self, admin_client, user_client, anon_client, user):
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204
+        assert user_client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что удалённый пользователь не проходит аутентификацию'
+        )
+        assert admin_client.get(
+            f'/api/v1/users/{user.username}/'
+        ).status_code == 404
+        response = anon_client.post('/api/v1/auth/signup/', data={
+            'username': user.username, 'email': user.email
+        })
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize('field', ('username', 'email'))
+    def test_profile_edit_keeps_deleted_names(self, user_client, admin, field):
+        admin.soft_delete()
+        response = user_client.patch(
+            '/api/v1/users/me/', data={field: getattr(admin, field)}
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что имя и почта удалённого пользователя '
+            'заняты до окончательного удаления'
+        )
+        assert field in response.json()
+
+    def test_deleted_author_is_hidden(self, settings, admin_client,
+                                      anon_client, title, titles, review,
+                                      user, django_assert_max_num_queries):
+        settings.API_CACHE_TIMEOUT = 60
+        title_url = f'/api/v1/titles/{title.id}/'
+        reviews_url = f'{title_url}reviews/'
+        review_url = f'{reviews_url}{review.id}/'
+        expected = anon_client.get(title_url).json()
+        own = Review.objects.create(
+            title=title, author=user, text='Текст', score=1
+        )
+        for other in titles[:5]:
+            Review.objects.create(
+                title=other, author=user, text='Текст', score=1
+            )
+        Comment.objects.create(review=review, author=user, text='Текст')
+        Comment.objects.create(review=review, author=review.author, text='2')
+        assert anon_client.get(title_url).json() != expected
+        with django_assert_max_num_queries(7):
+            admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert anon_client.get(title_url).json() == expected, (
+            'Проверьте, что отзывы удалённого автора сразу выпадают '
+            'из рейтинга'
+        )
+        for params in ({}, {'pagination': 'cursor'}):
+            ids = [
+                row['id'] for row in
+                anon_client.get(reviews_url, params).json()['results']
+            ]
+            assert own.id not in ids, (
+                'Проверьте, что отзывы удалённого автора скрыты'
+            )
+        assert anon_client.get(
+            f'{reviews_url}{own.id}/'
+        ).status_code == 404
+        assert anon_client.get(
+            f'{reviews_url}{own.id}/comments/'
+        ).status_code == 404
+        assert anon_client.get(f'{review_url}comments/').json()['count'] == 1
+        assert anon_client.get(review_url).json()['comments_count'] == 1
+        assert_counters_consistent()
+        purge_deleted()
+        assert Title.objects.get(
+            pk=title.pk
+        ).reviews_count == Review.objects.filter(title=title).count(), (
+            'Проверьте, что окончательное удаление не вычитает отзывы '
+            'повторно'
+        )
+        assert_counters_consistent()
+
+    def test_purge_title(self, title, titles, reviews, comments, user):
+        other = Review.objects.create(
+            title=titles[0], author=user, text='Текст', score=3
+        )
+        title.soft_delete()
+        call_command('purge_deleted', batch_size=5)
+        assert not Title.all_objects.filter(pk=title.pk).exists()
+        assert not Review.objects.filter(title_id=title.pk).exists()
+        assert not Comment.objects.filter(review__title_id=title.pk).exists()
+        assert Review.objects.filter(pk=other.pk).exists()
+        assert_counters_consistent()
+
+    def test_counter_signals_check_author_cheaply(
+            self, title, review, user, admin, django_assert_num_queries):
+        own = Review.objects.create(
+            title=title, author=user, text='Текст', score=1
+        )
+        user.soft_delete()
+        with django_assert_num_queries(4) as context:
+            Review.objects.get(pk=own.pk).delete()
+        assert not any(
+            '"reviews_user"."username"' in query['sql']
+            for query in context.captured_queries
+        ), 'Проверьте, что автор не загружается целиком ради проверки'
+        assert_counters_consistent()
+        # Автор уже загружен: проверка не обращается к базе.
+        with django_assert_num_queries(2):
+            Comment.objects.create(review=review, author=admin, text='Т')
+
+    def test_purge_user(self, title, titles, reviews, user, admin):
+        own = Review.objects.create(
+            title=titles[0], author=user, text='Текст', score=3
+        )
+        Comment.objects.create(review=own, author=admin, text='Ответ')
+        for review in reviews[:4]:
+            Comment.objects.create(review=review, author=user, text='Текст')
+            Comment.objects.create(review=review, author=admin, text='Текст')
+        user.soft_delete()
+        assert purge_deleted(batch_size=3) == (1, 6)
+        assert not User.all_objects.filter(pk=user.pk).exists()
+        assert not Review.objects.filter(pk=own.pk).exists()
+        assert Comment.objects.filter(author=admin).count() == 4
+        assert Title.objects.get(pk=titles[0].pk).reviews_count == 0
+        assert_counters_consistent()
+
+    def test_purge_invalidates_cached_rating(self, settings, anon_client,
+                                             title, user, admin):
+        settings.API_CACHE_TIMEOUT = 60
+        Review.objects.create(title=title, author=user, text='1', score=2)
+        Review.objects.create(title=title, author=admin, text='2', score=10)
+        url = f'/api/v1/titles/{title.id}/'
+        assert anon_client.get(url).json()['rating'] == 6
+        user.soft_delete()
+        purge_deleted()
+        assert anon_client.get(url).json()['rating'] == 10, (
+            'Проверьте, что удаление пачкой сбрасывает кэш произведений'
+        )
@@ -0,0 +1,58 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestUserCreation:
+
+    def test_duplicate_user_rejected(self, admin_client, user,
+                                     django_assert_max_num_queries):
+        with django_assert_max_num_queries(2):
+            response = admin_client.post('/api/v1/users/', data={
+                'username': user.username, 'email': 'other@yamdb.fake'
+            })
+        assert response.status_code == 400
+        response = admin_client.post('/api/v1/users/', data={
+            'username': 'other', 'email': user.email
+        })
+        assert response.status_code == 400
+        response = admin_client.post('/api/v1/users/', data={
+            'username': 'other', 'email': 'other@yamdb.fake'
+        })
+        assert response.status_code == 201
+
+    def test_bulk_create(self, admin_client, django_user_model,
+                         django_assert_max_num_queries):
+        payload = [
+            {'username': f'bulk{number}', 'email': f'bulk{number}@yamdb.fake'}
+            for number in range(50)
+        ]
+        with django_assert_max_num_queries(5):
+            response = admin_client.post(
+                '/api/v1/users/bulk/', data=payload, format='json'
+            )
+        assert response.status_code == 201, response.json()
+        assert len(response.json()) == len(payload)
+        assert django_user_model.objects.filter(
+            username__startswith='bulk'
+        ).count() == len(payload)
+
+        response = admin_client.post(
+            '/api/v1/users/bulk/', data=payload[:1], format='json'
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что существующие пользователи не создаются повторно'
+        )
+
+    def test_bulk_create_rejects_repeats(self, admin_client, user_client):
+        payload = [
+            {'username': 'same', 'email': 'one@yamdb.fake'},
+            {'username': 'same', 'email': 'two@yamdb.fake'},
+        ]
+        response = admin_client.post(
+            '/api/v1/users/bulk/', data=payload, format='json'
+        )
+        assert response.status_code == 400
+        response = user_client.post(
+            '/api/v1/users/bulk/', data=payload, format='json'
+        )
+        assert response.status_code == 403